@@ -0,0 +1,46 @@
+"""Micro-benchmark of header encoding on messages with many small fields.
+
+Compares to_byte_array() with the shared header tables against encoding
+each header with int.to_bytes() and encode_length().
+
+    PYTHONPATH=. python benchmarks/bench_headers.py
+"""
+import timeit
+
+from uttlv import TLV, Int8, Int16
+from uttlv.tlv import encoder_for
+
+
+def build_message(fields=64, **kwargs):
+    t = TLV(**kwargs)
+    for tag in range(fields):
+        t[tag] = (Int8(tag), Int16(tag), tag, b"abc", "name")[tag % 5]
+    return t
+
+
+def to_byte_array_without_tables(t):
+    """Same encoding as to_byte_array(), computing every header field."""
+    buffers = []
+    for tag, value in t._items.items():
+        formatted_value = encoder_for(value)().default(value, t)
+        buffers.append(
+            int(tag).to_bytes(t.tag_size, byteorder=t.endian) + t.encode_length(formatted_value)
+        )
+        buffers.append(formatted_value)
+    return b"".join(buffers)
+
+
+def main(number=2000):
+    for kwargs in ({}, {"len_size": 2}, {"tag_size": 2}):
+        t = build_message(**kwargs)
+        assert to_byte_array_without_tables(t) == t.to_byte_array()
+        plain = timeit.timeit(lambda: to_byte_array_without_tables(t), number=number)
+        tables = timeit.timeit(t.to_byte_array, number=number)
+        print(
+            f"{str(kwargs):20} per message: to_bytes {plain / number * 1e6:7.1f} us, "
+            f"tables {tables / number * 1e6:7.1f} us ({plain / tables:.2f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
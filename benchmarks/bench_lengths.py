@@ -0,0 +1,49 @@
+"""Benchmark of the length field forms: fixed 2 bytes, BER and varint.
+
+Reports the wire size, encode time and parse time of messages whose values
+have short, medium and long lengths.
+
+    PYTHONPATH=. python benchmarks/bench_lengths.py
+"""
+import timeit
+
+from uttlv import TLV
+from uttlv.tlv import VARINT
+
+# Value lengths of each message
+PROFILES = {
+    "short (< 128)": [4, 16, 40, 100] * 16,
+    "medium (128..16383)": [200, 1000, 4000, 16000] * 16,
+    "mixed": [4, 16, 200, 1000, 40, 100, 4000, 16000] * 8,
+}
+FORMS = {"fixed 2": 2, "ber": None, "varint": VARINT}
+
+
+def build_message(lengths, len_size):
+    t = TLV(tag_size=2, len_size=len_size)
+    for tag, length in enumerate(lengths):
+        t[tag] = bytes(length)
+    return t
+
+
+def main(number=500):
+    for profile, lengths in PROFILES.items():
+        print(profile)
+        for form, len_size in FORMS.items():
+            t = build_message(lengths, len_size)
+            arr = t.to_byte_array()
+            headers = len(arr) - sum(lengths)
+            encode = timeit.timeit(t.to_byte_array, number=number)
+
+            def parse():
+                TLV(tag_size=2, len_size=len_size).parse_array(arr)
+
+            decode = timeit.timeit(parse, number=number)
+            print(
+                f"  {form:8} headers {headers:5d} bytes, "
+                f"encode {encode / number * 1e6:7.1f} us, parse {decode / number * 1e6:7.1f} us"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,7 @@
+import pickle
+
+import pytest
+
 from uttlv import TLV, EmptyTLV, Int8, Int16, Int64
 
 
@@ -237,3 +241,19 @@ class TestBasic:
         exp = b"\0\1\x31\1\x81\x97" + auto_len_tag[0x01] + b"\2\x82\x80\x17" + auto_len_tag[0x02]
 
         assert exp == auto_len_tag.to_byte_array()
+
+    def test_value_subclass(self, tag):
+        class Label(str):
+            pass
+
+        tag[0x01] = Label("device")
+
+        assert tag[0x01] == "device"
+        with pytest.raises(TypeError):
+            tag[0x02] = 1.5
+
+    def test_config_keys(self):
+        tag_map = {0x01: {TLV.Config.Type: int, TLV.Config.Name: "count"}}
+
+        assert pickle.loads(pickle.dumps(tag_map)) == tag_map
+        assert list(TLV.Config) == [TLV.Config.Type, TLV.Config.Name, TLV.Config.Cache]
@@ -0,0 +1,87 @@
+import pytest
+
+from uttlv import TLV, EmptyTLV
+
+# FCI template: 6F { 84: DF name, A5: { 9F38: PDOL } }
+PDOL = bytes.fromhex("9f3803" + "9f1a02")
+FCI = bytes.fromhex("6f11" + "8407a0000000031010" + "a506") + PDOL
+
+
+@pytest.fixture(scope="function")
+def ber_tag():
+    yield TLV(tag_size=None)
+
+
+class TestBerTags:
+    """Test variable length BER tags."""
+
+    def test_parse(self, ber_tag):
+        ber_tag.parse_array(FCI)
+
+        assert isinstance(ber_tag[0x6F], TLV)
+        assert ber_tag[0x6F][0x84] == bytes.fromhex("a0000000031010")
+        assert ber_tag[0x6F][0xA5][0x9F38] == bytes.fromhex("9f1a02")
+
+    def test_round_trip(self, ber_tag):
+        ber_tag.parse_array(FCI)
+
+        assert ber_tag.to_byte_array() == FCI
+        assert ber_tag.encoded_size() == len(FCI)
+
+    def test_encode(self, ber_tag):
+        ber_tag[0x9F02] = b"\x00\x01"
+        ber_tag[0xDF8101] = b"\x02"
+        ber_tag[0x5A] = b"\x03"
+
+        assert ber_tag.to_byte_array() == bytes.fromhex("9f02020001" + "df81010102" + "5a0103")
+
+    def test_tag_map_overrides_constructed(self, ber_tag):
+        ber_tag.set_local_tag_map({0x6F: {TLV.Config.Type: bytes}})
+        ber_tag.parse_array(FCI)
+
+        assert ber_tag[0x6F] == FCI[2:]
+
+    def test_primitive_not_nested(self, ber_tag):
+        ber_tag.parse_array(bytes.fromhex("5f2a020978"))
+
+        assert ber_tag[0x5F2A] == b"\x09\x78"
+
+    def test_empty_constructed(self, ber_tag):
+        ber_tag.parse_array(bytes.fromhex("7000" + "5a0101"))
+
+        assert ber_tag[0x70] == TLV()
+
+    def test_truncated_tag(self, ber_tag):
+        with pytest.raises(ValueError):
+            ber_tag.parse_array(bytes.fromhex("5a01019f8181"))
+        with pytest.raises(ValueError):
+            ber_tag.parse_array(bytes.fromhex("5a01019f8101"))
+
+    def test_truncated_tag_in_window(self, ber_tag):
+        data = bytes.fromhex("9f8181" + "0100")
+
+        with pytest.raises(ValueError):
+            list(ber_tag.iter_fields(data, 0, 3))
+
+    def test_short_constructed(self, ber_tag):
+        ber_tag.parse_array(bytes.fromhex("e10100"))
+
+        assert ber_tag[0xE1] == b"\x00"
+
+    @pytest.mark.parametrize("tag", [0x1F, 0x3F, 0x9F81, 0x5A01, 0x9F0181])
+    def test_invalid_tag(self, ber_tag, tag):
+        with pytest.raises(TypeError):
+            ber_tag[tag] = b"a"
+
+    def test_tree(self, ber_tag):
+        ber_tag[0x9F02] = b"\x00\x01"
+
+        assert ber_tag.tree() == "9f02: 0001\r\n"
+
+    def test_empty_tlv(self):
+        assert EmptyTLV(0x9F02, tag_size=None).to_byte_array() == bytes.fromhex("9f0200")
+
+    def test_fixed_tag_size_unchanged(self, auto_len_tag):
+        auto_len_tag.parse_array(bytes.fromhex("2001ff"))
+
+        assert auto_len_tag[0x20] == b"\xff"
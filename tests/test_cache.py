@@ -0,0 +1,180 @@
+import pytest
+
+from uttlv import TLV, FrozenTLV, Int16, ParseLimits
+from uttlv.cache import LRUCache
+
+
+class TestLRUCache:
+    """Test the bounded decode cache."""
+
+    def test_lookup(self):
+        cache = LRUCache(2)
+        calls = []
+
+        def factory(value):
+            return lambda: calls.append(value) or value
+
+        assert cache.lookup("a", factory(1)) == 1
+        assert cache.lookup("a", factory(2)) == 1
+        assert cache.lookup("b", factory(3)) == 3
+        assert cache.lookup("c", factory(4)) == 4
+        assert "a" not in cache
+        assert calls == [1, 3, 4]
+        assert cache.stats == {"size": 2, "maxsize": 2, "hits": 1, "misses": 3, "evictions": 1}
+
+    def test_recently_used_kept(self):
+        cache = LRUCache(2)
+        cache.lookup("a", lambda: 1)
+        cache.lookup("b", lambda: 2)
+        cache.lookup("a", lambda: 1)
+        cache.lookup("c", lambda: 3)
+
+        assert "a" in cache
+        assert "b" not in cache
+
+    def test_invalid_size(self):
+        with pytest.raises(ValueError):
+            LRUCache(0)
+
+    def test_clear(self):
+        cache = LRUCache()
+        cache.lookup("a", lambda: 1)
+        cache.clear()
+
+        assert len(cache) == 0
+        assert cache.stats["misses"] == 0
+
+
+class TestDecodeCache:
+    """Test decode caches configured through tag maps."""
+
+    def test_str_values(self):
+        cache = LRUCache(16)
+        tag_map = {
+            0x01: {TLV.Config.Type: str, TLV.Config.Cache: cache},
+            0x02: {TLV.Config.Type: Int16, TLV.Config.Cache: cache},
+        }
+        src = TLV()
+        src[0x01] = "region-" + "eu"
+        src[0x02] = Int16(10)
+        arr = src.to_byte_array()
+
+        first = TLV()
+        first.set_local_tag_map(tag_map)
+        first.parse_array(arr)
+        second = TLV()
+        second.set_local_tag_map(tag_map)
+        second.parse_array(arr)
+
+        assert second[0x01] == "region-eu"
+        assert second[0x01] is first[0x01]
+        assert second[0x02] == 10
+        assert cache.stats["hits"] == 2
+        assert cache.stats["misses"] == 2
+
+    def test_endian_in_key(self):
+        cache = LRUCache(16)
+        tag_map = {0x01: {TLV.Config.Type: Int16, TLV.Config.Cache: cache}}
+        big = TLV()
+        big.set_local_tag_map(tag_map)
+        big.parse_array(b"\x01\x02\x01\x02")
+        little = TLV(endian="little")
+        little.set_local_tag_map(tag_map)
+        little.parse_array(b"\x01\x02\x01\x02")
+
+        assert big[0x01] == 0x0102
+        assert little[0x01] == 0x0201
+
+    def test_tlv_values_not_shared(self):
+        cache = LRUCache(16)
+        tag_map = {0x01: {TLV.Config.Type: TLV, TLV.Config.Cache: cache}}
+        arr = b"\x01\x03\x02\x01\x00"
+        first = TLV()
+        first.set_local_tag_map(tag_map)
+        first.parse_array(arr)
+        second = TLV()
+        second.set_local_tag_map(tag_map)
+        second.parse_array(arr)
+
+        assert first[0x01] is not second[0x01]
+        assert len(cache) == 0
+
+
+class TestSubtreeCache:
+    """Test caches of nested tag maps."""
+
+    def make_map(self, cache):
+        return {
+            0x0A: {
+                TLV.Config.Type: {0x01: {TLV.Config.Type: Int16}, 0x02: {TLV.Config.Type: str}},
+                TLV.Config.Cache: cache,
+            }
+        }
+
+    def make_array(self, count):
+        t = TLV()
+        t[0x0A] = TLV()
+        t[0x0A][0x01] = Int16(count)
+        t[0x0A][0x02] = "device"
+        t[0x0B] = count
+        return t.to_byte_array()
+
+    def parse(self, tag_map, arr):
+        t = TLV()
+        t.set_local_tag_map(tag_map)
+        t.parse_array(arr)
+        return t
+
+    def test_shared_subtree(self):
+        cache = LRUCache(16)
+        tag_map = self.make_map(cache)
+        first = self.parse(tag_map, self.make_array(1))
+        second = self.parse(tag_map, self.make_array(1))
+        other = self.parse(tag_map, self.make_array(2))
+
+        assert isinstance(first[0x0A], FrozenTLV)
+        assert first[0x0A] is second[0x0A]
+        assert first[0x0A] is not other[0x0A]
+        assert second[0x0A][0x01] == 1
+        assert second[0x0A][0x02] == "device"
+        assert other[0x0A][0x01] == 2
+        assert cache.stats["hits"] == 1
+        assert cache.stats["misses"] == 2
+
+    def test_round_trip(self):
+        tag_map = self.make_map(LRUCache(16))
+        arr = self.make_array(1)
+
+        assert self.parse(tag_map, arr).to_byte_array() == arr
+
+    def test_tag_map_set_again(self):
+        tag_map = self.make_map(LRUCache(16))
+        t = self.parse(tag_map, self.make_array(1))
+        t.set_local_tag_map(tag_map)
+
+        assert t[0x0A].tag_map is tag_map[0x0A][TLV.Config.Type]
+        with pytest.raises(TypeError):
+            t[0x0A].set_local_tag_map({})
+
+    def test_settings_in_key(self):
+        cache = LRUCache(16)
+        tag_map = self.make_map(cache)
+        arr = self.make_array(1)
+        self.parse(tag_map, arr)
+        t = TLV(endian="little")
+        t.set_local_tag_map(tag_map)
+        t.parse_array(arr)
+
+        assert t[0x0A][0x01] == 0x0100
+        assert cache.stats["misses"] == 2
+
+    def test_limits_values_in_key(self):
+        cache = LRUCache(16)
+        tag_map = self.make_map(cache)
+        arr = self.make_array(1)
+        for _ in range(2):
+            t = TLV(limits=ParseLimits(max_depth=4))
+            t.set_local_tag_map(tag_map)
+            t.parse_array(arr)
+
+        assert cache.stats["hits"] == 1
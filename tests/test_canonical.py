@@ -0,0 +1,83 @@
+import pytest
+
+from uttlv import TLV
+from uttlv.canonical import OffsetTable, is_canonical, merge
+
+
+def make_tlv(order):
+    t = TLV()
+    for tag in order:
+        if tag == 0x05:
+            t[tag] = TLV()
+            t[tag][0x02] = b"\x02"
+            t[tag][0x01] = b"\x01"
+        else:
+            t[tag] = bytes([tag])
+    return t
+
+
+class TestCanonical:
+    """Test canonical encoding, offset tables and merges."""
+
+    def test_encode_order_independent(self):
+        first = make_tlv([0x03, 0x01, 0x05, 0x02])
+        second = make_tlv([0x05, 0x02, 0x03, 0x01])
+
+        assert first.to_byte_array() != second.to_byte_array()
+        assert first.to_byte_array(canonical=True) == second.to_byte_array(canonical=True)
+        assert first.to_byte_array(canonical=True) == bytes.fromhex(
+            "010101" "020102" "030103" "0506" "010101" "020102"
+        )
+
+    def test_frozen(self):
+        t = make_tlv([0x03, 0x01])
+        frozen = t.freeze()
+
+        assert frozen.to_byte_array() == t.to_byte_array()
+        assert frozen.to_byte_array(canonical=True) == t.to_byte_array(canonical=True)
+
+    def test_offset_table(self):
+        data = make_tlv([0x05, 0x03, 0x01]).to_byte_array(canonical=True)
+        table = OffsetTable(data)
+
+        assert len(table) == 3
+        assert 0x03 in table
+        assert 0x02 not in table
+        assert table.find(0x03) == (5, 1)
+        assert bytes(table.value(0x01)) == b"\x01"
+        assert table.value(0x04) is None
+        assert bytes(table.nested(0x05).value(0x02)) == b"\x02"
+        with pytest.raises(KeyError):
+            table.nested(0x04)
+
+    def test_not_canonical(self):
+        data = make_tlv([0x03, 0x01]).to_byte_array()
+
+        assert not is_canonical(data)
+        assert is_canonical(make_tlv([0x03, 0x01]).to_byte_array(canonical=True))
+        with pytest.raises(ValueError):
+            OffsetTable(data)
+
+    def test_merge(self):
+        first = TLV()
+        first[0x01] = b"a"
+        first[0x03] = b"c"
+        second = TLV()
+        second[0x02] = b"b"
+        second[0x03] = b"new"
+        second[0x04] = b"d"
+        merged = merge(first.to_byte_array(canonical=True), second.to_byte_array(canonical=True))
+
+        expected = TLV()
+        expected[0x01] = b"a"
+        expected[0x02] = b"b"
+        expected[0x03] = b"new"
+        expected[0x04] = b"d"
+        assert merged == expected.to_byte_array(canonical=True)
+        assert merge(b"", merged) == merged
+
+    def test_merge_not_canonical(self):
+        data = make_tlv([0x03, 0x01]).to_byte_array()
+
+        with pytest.raises(ValueError):
+            merge(data, b"")
@@ -0,0 +1,98 @@
+import zlib
+
+import pytest
+
+from uttlv import TLV, Checksum
+from uttlv.fileslice import FileSlice
+from uttlv.pool import TLVPool
+from uttlv.writer import write_message
+
+CRC = Checksum(0xFE)
+# Tags outside the global tag map of conftest
+TAG_MAP = {0x0B: {TLV.Config.Type: {0x01: {TLV.Config.Type: bytes}}}}
+
+
+def make_tlv(checksum=CRC):
+    t = TLV(checksum=checksum)
+    t[0x0A] = b"value"
+    t[0x0B] = TLV()
+    t[0x0B][0x01] = b"nested"
+    return t
+
+
+class TestChecksum:
+    """Test checksum trailing fields."""
+
+    def test_encode(self):
+        arr = make_tlv().to_byte_array()
+        body = arr[:-6]
+
+        assert arr[-6:-4] == b"\xfe\x04"
+        assert arr[-4:] == zlib.crc32(body).to_bytes(4, "big")
+        assert len(arr) == make_tlv().encoded_size()
+        assert body == TLV.to_byte_array(make_tlv(checksum=None))
+
+    def test_adler32(self):
+        t = make_tlv()
+        t.checksum = Checksum(0xFE, "adler32")
+        arr = t.to_byte_array()
+
+        assert arr[-4:] == zlib.adler32(arr[:-6]).to_bytes(4, "big")
+        with pytest.raises(ValueError):
+            Checksum(0xFE, "md5")
+
+    def test_parse(self):
+        t = TLV(checksum=CRC)
+        t.parse_array(make_tlv().to_byte_array())
+
+        assert t[0x0A] == b"value"
+        assert 0xFE not in t._items
+        assert t == make_tlv()
+
+    def test_mismatch(self):
+        arr = bytearray(make_tlv().to_byte_array())
+        arr[3] ^= 0xFF
+
+        with pytest.raises(ValueError, match="mismatch"):
+            TLV(checksum=CRC).parse_array(bytes(arr))
+
+    def test_missing(self):
+        arr = make_tlv(checksum=None).to_byte_array()
+
+        with pytest.raises(ValueError, match="Missing"):
+            TLV(checksum=CRC).parse_array(arr)
+        with pytest.raises(ValueError, match="after checksum"):
+            TLV(checksum=CRC).parse_array(make_tlv().to_byte_array() + b"\x0c\x01\x00")
+
+    def test_canonical(self):
+        arr = make_tlv().to_byte_array(canonical=True)
+        t = TLV(checksum=CRC)
+        t.set_local_tag_map(TAG_MAP)
+        t.parse_array(arr)
+
+        assert t[0x0B][0x01] == b"nested"
+        assert t.to_byte_array(canonical=True) == arr
+
+    def test_streamed(self, tmp_path):
+        path = tmp_path / "value.bin"
+        path.write_bytes(b"x" * 1000)
+        t = TLV(checksum=CRC)
+        t[0x0A] = FileSlice(str(path))
+        out_path = tmp_path / "message.bin"
+        with open(out_path, "wb") as out:
+            write_message(out, t)
+
+        assert out_path.read_bytes() == t.to_byte_array()
+        parsed = TLV(checksum=CRC)
+        parsed.parse_file(str(out_path), spill_threshold=100)
+        assert isinstance(parsed[0x0A], FileSlice)
+
+    def test_pool(self):
+        pool = TLVPool(checksum=CRC)
+        arr = make_tlv().to_byte_array()
+        t = pool.parse(arr, TAG_MAP)
+
+        assert t[0x0B].checksum is None
+        assert t.to_byte_array(canonical=True) == arr
+        pool.release(t)
+        assert all(pool.acquire().checksum is CRC for _ in range(2))
@@ -0,0 +1,58 @@
+import json
+
+from uttlv import TLV
+from uttlv.cli import load_tag_map, main
+from uttlv.framing import frame_records
+
+# Tags outside the global tag map of conftest
+RECORDS = [bytes.fromhex("0a0400000005" "0b026869"), bytes.fromhex("0c04aabbccdd")]
+
+
+class TestCli:
+    """Test the command line decoder."""
+
+    def test_load_tag_map(self):
+        tag_map = load_tag_map(
+            {"0x01": {"name": "COUNT", "type": "int"}, "2": {"type": {"0x01": {"type": "str"}}}}
+        )
+
+        assert tag_map == {
+            0x01: {TLV.Config.Name: "COUNT", TLV.Config.Type: int},
+            0x02: {TLV.Config.Type: {0x01: {TLV.Config.Type: str}}},
+        }
+
+    def test_decode_hex(self, tmp_path, capsys):
+        records = tmp_path / "records.hex"
+        records.write_text("\n".join(record.hex() for record in RECORDS) + "\n# comment\n")
+        tag_map = tmp_path / "map.json"
+        tag_map.write_text(json.dumps({"0x0a": {"name": "COUNT", "type": "int"}}))
+
+        assert main(["-m", str(tag_map), "-n", str(records)]) == 0
+        out = capsys.readouterr().out
+        assert "# record 0, 10 bytes\nCOUNT: 5\n0b: 6869\n" in out
+        assert "# record 1, 6 bytes\n0c: aabbccdd\n" in out
+
+    def test_decode_framed_binary(self, tmp_path, capsys):
+        records = tmp_path / "records.bin"
+        records.write_bytes(frame_records(RECORDS))
+
+        assert main(["--binary", "--framed", str(records)]) == 0
+        assert capsys.readouterr().out.count("# record") == 2
+
+    def test_profile(self, tmp_path, capsys):
+        records = tmp_path / "records.hex"
+        records.write_text("\n".join(record.hex() for record in RECORDS))
+
+        assert main(["--profile", "--repeat", "3", str(records)]) == 0
+        out = capsys.readouterr().out
+        assert out.startswith("6 records, 48 bytes in ")
+        assert "records/s" in out
+        assert "0a 18 37.5%" in out
+        assert "parse_array" in out
+
+    def test_invalid_input(self, tmp_path, capsys):
+        records = tmp_path / "records.hex"
+        records.write_text("zz\n")
+
+        assert main([str(records)]) == 1
+        assert capsys.readouterr().err.startswith("uttlv: ")
@@ -0,0 +1,79 @@
+import pytest
+
+from uttlv import TLV, Int8
+from uttlv.columnar import FixedColumn, VarColumn, decode_columns
+from uttlv.registry import TagMapRegistry
+
+column_tag_map = {
+    0x01: {TLV.Config.Type: int, TLV.Config.Name: "COUNT"},
+    0x02: {TLV.Config.Type: Int8, TLV.Config.Name: "FLAGS"},
+    0x03: {TLV.Config.Type: str, TLV.Config.Name: "NAME"},
+    0x04: {TLV.Config.Type: bytes},
+}
+
+
+def make_records():
+    records = []
+    for i in range(3):
+        t = TLV()
+        t[0x01] = i * 100
+        if i != 1:
+            t[0x02] = Int8(i)
+            t[0x03] = f"dev{i}"
+        t[0x04] = bytes([i] * i)
+        t[0x05] = "ignored"
+        records.append(t.to_byte_array())
+    return records
+
+
+class TestColumnar:
+    """Test columnar decoding of record streams."""
+
+    def test_column_types(self):
+        columns = decode_columns(make_records(), column_tag_map)
+
+        assert set(columns) == {"COUNT", "FLAGS", "NAME", 0x04}
+        assert isinstance(columns["COUNT"], FixedColumn)
+        assert isinstance(columns["NAME"], VarColumn)
+        assert all(len(c) == 3 for c in columns.values())
+
+    def test_int_column(self):
+        columns = decode_columns(make_records(), column_tag_map)
+
+        assert list(columns["COUNT"].values) == [0, 100, 200]
+        # Same width as the encoder of int
+        assert columns["COUNT"].values.itemsize == 4
+        assert list(columns["FLAGS"].values) == [0, 0, 2]
+        assert [bool(v) for v in columns["FLAGS"].valid] == [True, False, True]
+        assert columns["FLAGS"][1] is None
+
+    def test_handle(self):
+        handle = TagMapRegistry().register("columns", column_tag_map)
+        columns = decode_columns(make_records(), handle)
+
+        assert list(columns["COUNT"].values) == [0, 100, 200]
+
+    def test_value_too_wide(self):
+        records = make_records()
+        t = TLV()
+        t[0x02] = 300
+        records.insert(1, t.to_byte_array())
+
+        with pytest.raises(ValueError, match="tag 2 in record 1"):
+            decode_columns(records, column_tag_map)
+
+    def test_var_column(self):
+        columns = decode_columns(make_records(), column_tag_map)
+        names = columns["NAME"]
+
+        assert list(names.offsets) == [0, 4, 4, 8]
+        assert bytes(names.data) == b"dev0dev2"
+        assert [names[i] for i in range(3)] == ["dev0", None, "dev2"]
+        assert [columns[0x04][i] for i in range(3)] == [b"", b"\x01", b"\x02\x02"]
+
+    def test_codec_settings(self):
+        t = TLV(tag_size=2, len_size=2, endian="little")
+        t[0x0102] = 7
+        columns = decode_columns([t.to_byte_array()], {0x0102: {TLV.Config.Type: int}}, t)
+
+        assert list(columns[0x0102].values) == [7]
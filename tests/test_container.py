@@ -0,0 +1,96 @@
+import io
+
+import pytest
+
+from uttlv import TLV
+from uttlv.container import BlockReader, BlockWriter
+from uttlv.framing import frame_records, iter_frames
+from uttlv.registry import TagMapRegistry
+
+record_tag_map = {
+    0x01: {TLV.Config.Type: int, TLV.Config.Name: "SEQ"},
+    0x02: {TLV.Config.Type: str, TLV.Config.Name: "TEXT"},
+}
+
+
+def make_record(i):
+    t = TLV()
+    t[0x01] = i
+    t[0x02] = f"record {i}"
+    return t
+
+
+@pytest.fixture(scope="function", params=["zlib", "lzma", "none"])
+def container(request, tmp_path):
+    path = tmp_path / f"records.{request.param}"
+    with BlockWriter(path, compression=request.param, block_size=200) as writer:
+        writer.write_many(make_record(i) for i in range(100))
+    yield path
+
+
+class TestFraming:
+    def test_round_trip(self):
+        records = [b"", b"abc", make_record(1)]
+        frames = list(iter_frames(frame_records(records)))
+
+        assert [bytes(f) for f in frames] == [b"", b"abc", make_record(1).to_byte_array()]
+
+    def test_truncated(self):
+        with pytest.raises(ValueError):
+            list(iter_frames(frame_records([b"abc"])[:-1]))
+
+
+class TestContainer:
+    """Test the block compressed container."""
+
+    def test_read_all(self, container):
+        with BlockReader(container) as reader:
+            assert len(reader) > 1
+            assert reader.record_count == 100
+            assert list(reader) == [make_record(i).to_byte_array() for i in range(100)]
+
+    def test_seek(self, container):
+        with BlockReader(container) as reader:
+            index = reader.block_of(57)
+            assert reader.record(57) == make_record(57).to_byte_array()
+            records = reader.parse_block(index, tag_map=record_tag_map)
+            assert any(r["TEXT"] == "record 57" for r in records)
+            with pytest.raises(IndexError):
+                reader.record(100)
+
+    def test_parallel(self, container):
+        with BlockReader(str(container)) as reader:
+            blocks = list(reader.parallel_blocks(processes=2, tag_map=record_tag_map))
+
+        records = [record for block in blocks for record in block]
+        assert [r["SEQ"] for r in records] == list(range(100))
+        assert records[3]["TEXT"] == "record 3"
+
+    def test_parallel_handle(self, container):
+        handle = TagMapRegistry().register("records", record_tag_map)
+        with BlockReader(str(container)) as reader:
+            blocks = list(reader.parallel_blocks(processes=2, tag_map=handle))
+            first = reader.parse_block(0, tag_map=handle)
+
+        assert blocks[0][3]["TEXT"] == "record 3"
+        assert first[3]["SEQ"] == 3
+
+    def test_file_object(self):
+        buf = io.BytesIO()
+        writer = BlockWriter(buf)
+        writer.write(b"\x01\x01\x01")
+        writer.close()
+        buf.seek(0)
+
+        reader = BlockReader(buf)
+        assert list(reader) == [b"\x01\x01\x01"]
+        with pytest.raises(ValueError):
+            list(reader.parallel_blocks())
+
+    def test_not_a_container(self):
+        with pytest.raises(ValueError):
+            BlockReader(io.BytesIO(b"garbage" * 10))
+
+    def test_invalid_compression(self, tmp_path):
+        with pytest.raises(ValueError):
+            BlockWriter(tmp_path / "x", compression="zip")
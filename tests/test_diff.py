@@ -0,0 +1,80 @@
+from uttlv import TLV, Int8
+from uttlv.diff import diff
+from uttlv.registry import TagMapRegistry
+
+from .conftest import nested_tag_map
+
+
+def make_state(leaf=1, data=42):
+    t = TLV()
+    t[0x01] = TLV()
+    t[0x01][0x01] = TLV()
+    t[0x01][0x01][0x01] = leaf
+    t[0x02] = data
+    t.set_local_tag_map(nested_tag_map)
+    return t
+
+
+class TestDiff:
+    """Test structural diff of messages."""
+
+    def test_equal(self):
+        assert not diff(make_state(), make_state())
+        assert not diff(make_state().to_byte_array(), make_state().to_byte_array(), nested_tag_map)
+
+    def test_objects(self):
+        old = make_state(data=41)
+        old[0x04] = b"gone"
+        new = make_state(leaf=2)
+        new[0x03] = b"new"
+        result = diff(old, new)
+
+        assert result.added == [(0x03,)]
+        assert result.removed == [(0x04,)]
+        assert result.changed == [(0x01, 0x01, 0x01), (0x02,)]
+
+    def test_value_types(self):
+        old = TLV()
+        old[0x01] = 1
+        new = TLV()
+        new[0x01] = Int8(1)
+
+        assert diff(old, new).changed == [(0x01,)]
+
+    def test_buffers(self):
+        old = make_state(data=41)
+        old[0x04] = b"gone"
+        new = make_state(leaf=2)
+        new[0x03] = b"new"
+        result = diff(old.to_byte_array(), new.to_byte_array(), nested_tag_map)
+
+        assert result.added == [(0x03,)]
+        assert result.removed == [(0x04,)]
+        assert result.changed == [(0x01, 0x01, 0x01), (0x02,)]
+
+    def test_handle(self):
+        handle = TagMapRegistry().register("nested", nested_tag_map)
+        old = make_state().to_byte_array()
+        new = make_state(leaf=2).to_byte_array()
+
+        assert diff(old, new, handle).changed == [(0x01, 0x01, 0x01)]
+
+    def test_untyped_nested_is_leaf(self):
+        old = make_state().to_byte_array()
+        new = make_state(leaf=2).to_byte_array()
+
+        assert diff(old, new, {}).changed == [(0x01,)]
+
+    def test_mixed(self):
+        old = make_state()
+        new = make_state(leaf=2).to_byte_array()
+
+        assert diff(old, memoryview(new)).changed == [(0x01, 0x01, 0x01)]
+        assert diff(memoryview(new), old).changed == [(0x01, 0x01, 0x01)]
+
+    def test_frozen(self):
+        old = make_state().freeze()
+        new = make_state(leaf=3).freeze()
+
+        assert diff(old, old.freeze()).changed == []
+        assert diff(old, new).changed == [(0x01, 0x01, 0x01)]
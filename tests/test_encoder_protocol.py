@@ -0,0 +1,122 @@
+import struct
+
+import pytest
+
+from uttlv import TLV, Checksum, DefaultEncoder
+from uttlv.shm import TLVView
+from uttlv.tlv import ALLOWED_TYPES
+
+POINT = struct.Struct(">hh")
+
+
+class Point:
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+    def __eq__(self, other):
+        return (self.x, self.y) == (other.x, other.y)
+
+
+class PointEncoder(DefaultEncoder):
+    """Encoder working on buffers only, it has no default() nor parse()."""
+
+    calls = []
+
+    def size_of(self, obj, _cls):
+        return POINT.size
+
+    def encode_into(self, value, buffer, offset):
+        POINT.pack_into(buffer, offset, value.x, value.y)
+        return POINT.size
+
+    def decode_from(self, buffer, offset, length, codec):
+        self.calls.append(type(buffer))
+        return Point(*POINT.unpack_from(buffer, offset))
+
+
+# Tags outside the global tag map of conftest
+TAG_MAP = {0x0A: {TLV.Config.Type: Point}, 0x0B: {TLV.Config.Type: str}}
+ARRAY = bytes.fromhex("0a04fffe0003" "0b026869" "0c0101")
+
+
+@pytest.fixture(scope="function")
+def point_type():
+    ALLOWED_TYPES[Point] = PointEncoder
+    PointEncoder.calls.clear()
+    yield
+    del ALLOWED_TYPES[Point]
+
+
+def make_tlv(**kwargs):
+    t = TLV(**kwargs)
+    t[0x0A] = Point(-2, 3)
+    t[0x0B] = "hi"
+    t[0x0C] = TLV()
+    t[0x0C][0x01] = b"\x01"
+    return t
+
+
+class TestEncoderProtocol:
+    """Test encoders reading and writing buffers in place."""
+
+    def test_encode(self, point_type):
+        t = make_tlv()
+        t[0x0C] = b"\x01"
+
+        assert t.to_byte_array() == ARRAY
+        assert t.encoded_size() == len(ARRAY)
+
+    def test_parse(self, point_type):
+        t = TLV()
+        t.set_local_tag_map(TAG_MAP)
+        t.parse_array(ARRAY)
+
+        assert t[0x0A] == Point(-2, 3)
+        assert t[0x0B] == "hi"
+        assert PointEncoder.calls == [bytes]
+
+    def test_view(self, point_type):
+        view = TLVView(memoryview(ARRAY), tag_map=TAG_MAP)
+
+        assert view[0x0A] == Point(-2, 3)
+        assert view[0x0B] == "hi"
+        assert PointEncoder.calls == [memoryview]
+
+    def test_encode_into(self, point_type):
+        t = make_tlv()
+        buffer = bytearray(4 + t.encoded_size())
+
+        assert t.encode_into(buffer, 4) == t.encoded_size()
+        assert bytes(buffer[4:]) == t.to_byte_array()
+        assert bytes(buffer[:4]) == bytes(4)
+
+    def test_encode_into_checksum(self, point_type):
+        t = make_tlv(checksum=Checksum(0xFE))
+        buffer = bytearray(t.encoded_size())
+        t.encode_into(buffer)
+
+        assert bytes(buffer) == t.to_byte_array()
+
+    def test_encode_into_checksum_per_field(self, point_type):
+        sizes = []
+
+        class SpyChecksum(Checksum):
+            def update(self, data, digest):
+                sizes.append(len(data))
+                return super().update(data, digest)
+
+        t = make_tlv(checksum=SpyChecksum(0xFE))
+        t.encode_into(bytearray(t.encoded_size()))
+
+        # Tag 0x0A with a point, tag 0x0B with "hi", nested tag 0x0C
+        assert sizes == [6, 4, 5]
+
+    def test_encode_into_frozen(self):
+        t = TLV()
+        t[0x0C] = b"\x01"
+        frozen = t.freeze()
+        buffer = bytearray(frozen.encoded_size())
+
+        assert frozen.encode_into(memoryview(buffer)) == len(buffer)
+        assert bytes(buffer) == frozen.to_byte_array()
@@ -0,0 +1,76 @@
+import pytest
+
+from uttlv import TLV, Int16
+from uttlv.export import build_tlv, export
+from uttlv.framing import iter_frames
+from uttlv.registry import TagMapRegistry
+
+# Tags outside the global tag map of conftest
+TAG_MAP = {
+    0x0A: {TLV.Config.Type: Int16, TLV.Config.Name: "ID"},
+    0x0B: {TLV.Config.Type: str, TLV.Config.Name: "NAME"},
+    0x0C: {TLV.Config.Type: {0x01: {TLV.Config.Type: int}}, TLV.Config.Name: "DEVICE"},
+}
+
+
+def make_rows(count):
+    return ({"ID": i, "NAME": f"row-{i}", "DEVICE": {0x01: i * 2}} for i in range(count))
+
+
+def expected(count):
+    return [build_tlv(row, TAG_MAP).to_byte_array() for row in make_rows(count)]
+
+
+class TestExport:
+    """Test bulk export of plain rows."""
+
+    def test_build_tlv(self):
+        t = build_tlv({"ID": 1, 0x0B: "one", "DEVICE": {0x01: 2}}, TAG_MAP)
+
+        assert isinstance(t[0x0A], Int16)
+        assert t.to_byte_array() == bytes.fromhex("0a020001" "0b036f6e65" "0c06" "010400000002")
+        with pytest.raises(KeyError):
+            build_tlv({"MISSING": 1}, TAG_MAP)
+
+    def test_in_process(self):
+        out = bytearray()
+        stats = export(make_rows(25), TAG_MAP, out, processes=0, chunk_size=10)
+
+        assert bytes(out) == b"".join(expected(25))
+        assert stats.records == 25
+        assert stats.size == len(out)
+        assert stats.records_per_second > 0
+
+    def test_process_pool(self, tmp_path):
+        path = tmp_path / "export.bin"
+        stats = export(make_rows(100), TAG_MAP, path, processes=2, chunk_size=7, framed=True)
+
+        data = path.read_bytes()
+        assert [bytes(record) for record in iter_frames(data)] == expected(100)
+        assert stats.records == 100
+        assert stats.size == len(data)
+
+    def test_settings(self):
+        out = bytearray()
+        export([{"ID": 1}], TAG_MAP, out, processes=0, tag_size=2, len_size=2)
+
+        assert bytes(out) == bytes.fromhex("000a00020001")
+
+    def test_handle(self, tmp_path):
+        handle = TagMapRegistry().register("export", TAG_MAP)
+        path = tmp_path / "export.bin"
+        export(make_rows(10), handle, path, processes=2, chunk_size=3)
+
+        assert path.read_bytes() == b"".join(expected(10))
+        assert build_tlv({"ID": 1}, handle).to_byte_array() == bytes.fromhex("0a020001")
+
+    def test_global_handle(self):
+        handle = TagMapRegistry().register("global", {0x0D: {TLV.Config.Type: Int16}})
+        old_map = TLV._global_tag_map
+        TLV.set_global_tag_map(handle)
+        try:
+            t = build_tlv({0x0E: {0x0D: 1}}, {})
+        finally:
+            TLV.set_global_tag_map(old_map)
+
+        assert t.to_byte_array() == bytes.fromhex("0e04" "0d020001")
@@ -0,0 +1,108 @@
+import os
+import socket
+import threading
+
+import pytest
+
+from uttlv import TLV
+from uttlv.fileslice import FileSlice
+from uttlv.writer import write_message
+
+
+@pytest.fixture(scope="function")
+def blob(tmp_path):
+    path = tmp_path / "blob.bin"
+    path.write_bytes(bytes(c % 251 for c in range(300000)))
+    yield path
+
+
+class TestFileSlice:
+    """Test file backed values."""
+
+    def test_slice(self, blob):
+        value = FileSlice(blob, 10, 1000)
+
+        assert len(value) == 1000
+        assert value.read() == blob.read_bytes()[10:1010]
+        assert b"".join(value.chunks(64)) == value.read()
+        assert len(FileSlice(blob, 100)) == 300000 - 100
+
+    def test_past_end_of_file(self, blob):
+        with pytest.raises(ValueError):
+            FileSlice(blob, 299990, 100).read()
+
+    def test_encode(self, blob, auto_len_tag):
+        value = FileSlice(blob, 5, 200)
+        auto_len_tag[0x01] = value
+        exp = b"\x01\x81\xc8" + value.read()
+
+        assert auto_len_tag.to_byte_array() == exp
+        assert auto_len_tag.encoded_size() == len(exp)
+        assert value in auto_len_tag.to_buffers(streamed=True)
+
+    def test_write_file(self, blob, tmp_path, auto_len_tag):
+        child = TLV()
+        child[0x01] = FileSlice(blob)
+        auto_len_tag[0x01] = b"head"
+        auto_len_tag[0x02] = child
+        auto_len_tag[0x03] = FileSlice(str(blob), 7, 7)
+        out = tmp_path / "out.bin"
+        with open(out, "wb") as f:
+            written = write_message(f, auto_len_tag)
+
+        assert out.read_bytes() == auto_len_tag.to_byte_array()
+        assert written == auto_len_tag.encoded_size()
+
+    def test_write_socket(self, blob, auto_len_tag):
+        auto_len_tag[0x01] = FileSlice(blob)
+        exp = auto_len_tag.to_byte_array()
+        left, right = socket.socketpair()
+        received = bytearray()
+
+        def reader():
+            while len(received) < len(exp):
+                received.extend(right.recv(65536))
+
+        thread = threading.Thread(target=reader)
+        thread.start()
+        try:
+            write_message(left, auto_len_tag)
+            thread.join()
+        finally:
+            left.close()
+            right.close()
+
+        assert bytes(received) == exp
+
+    def test_parse_file(self, blob, tmp_path, apply_global_map):
+        t = TLV()
+        t[0x01] = 7
+        t[0x03] = "name"
+        t[0x05] = bytes(10)
+        t[0x06] = FileSlice(blob)
+        t[0x20] = bytes(500)
+        path = tmp_path / "message.bin"
+        path.write_bytes(t.to_byte_array())
+
+        parsed = TLV()
+        parsed.parse_file(path, spill_threshold=100)
+
+        assert parsed[0x01] == 7
+        assert parsed[0x03] == "name"
+        assert parsed[0x05] == bytes(10)
+        assert isinstance(parsed[0x06], FileSlice)
+        assert parsed[0x06].read() == blob.read_bytes()
+        assert isinstance(parsed[0x20], FileSlice)
+        assert parsed == t
+
+    def test_parse_file_descriptor(self, tmp_path, auto_len_tag):
+        auto_len_tag[0x20] = bytes(500)
+        path = tmp_path / "message.bin"
+        path.write_bytes(auto_len_tag.to_byte_array())
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            parsed = TLV()
+            parsed.parse_file(fd)
+            assert parsed[0x20] == bytes(500)
+        finally:
+            os.close(fd)
@@ -0,0 +1,79 @@
+import copy
+import pickle
+import threading
+
+import pytest
+
+from uttlv import TLV, FrozenTLV
+
+from .conftest import nested_tag_map
+
+
+class TestFrozen:
+    """Test immutable TLV objects."""
+
+    def test_freeze(self, multi_tag):
+        frozen = multi_tag.freeze()
+
+        assert isinstance(frozen, FrozenTLV)
+        assert isinstance(frozen[0x08], FrozenTLV)
+        assert frozen == multi_tag
+        assert hash(frozen) == hash(multi_tag)
+        assert frozen.freeze() is frozen
+
+    def test_immutable(self, multi_tag):
+        frozen = multi_tag.freeze()
+
+        with pytest.raises(TypeError):
+            frozen[0x01] = 1
+        with pytest.raises(TypeError):
+            frozen._items[0x01] = 1
+        with pytest.raises(TypeError):
+            frozen.set_local_tag_map({})
+        with pytest.raises(TypeError):
+            frozen.parse_array(b"\x01\x01\x01")
+
+    def test_source_changes_not_visible(self, multi_tag):
+        frozen = multi_tag.freeze()
+        multi_tag[0x01] = 5
+
+        assert frozen[0x01] == 0xA9
+
+    def test_from_array(self, nested_tag):
+        arr = nested_tag.to_byte_array()
+        frozen = FrozenTLV.from_array(arr, tag_map=nested_tag_map)
+
+        assert frozen.to_byte_array() is arr
+        assert frozen["FIRST_NEST"]["SECOND_NEST"]["LEAF"] == 1
+        assert frozen.tag_map is nested_tag_map
+
+    def test_bound_tag_map(self, apply_global_map):
+        frozen = FrozenTLV.from_array([0x01, 0x04, 0x00, 0x00, 0x00, 0x02])
+        old_map = TLV._global_tag_map
+        TLV.set_global_tag_map({})
+        try:
+            assert frozen.NUM_POINTS == 2
+        finally:
+            TLV.set_global_tag_map(old_map)
+
+    def test_copy_and_pickle(self, multi_tag):
+        frozen = multi_tag.freeze()
+
+        assert pickle.loads(pickle.dumps(frozen)) == frozen
+        assert copy.deepcopy(multi_tag) == multi_tag
+        assert pickle.loads(pickle.dumps(TLV.Config.Type)) is TLV.Config.Type
+
+    def test_shared_between_threads(self, multi_tag):
+        frozen = multi_tag.freeze()
+        results = []
+
+        def worker():
+            results.append((frozen[0x01], frozen.tree(), hash(frozen)))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(set(results)) == 1
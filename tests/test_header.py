@@ -0,0 +1,52 @@
+import pytest
+
+from uttlv import TLV
+from uttlv.tlv import HeaderTable
+
+
+class TestHeaderTable:
+    """Test precomputed header tables."""
+
+    @pytest.mark.parametrize(
+        "kwargs", [{}, {"len_size": 2}, {"tag_size": 2, "endian": "little"}, {"len_size": 4}]
+    )
+    def test_same_as_encode_length(self, kwargs):
+        t = TLV(**kwargs)
+        table = t.header_table()
+
+        for length in (0, 1, 127, 128, 255, 256, 300, 65535):
+            value = bytes(length)
+            assert table.length(length) == t.encode_length(value)
+            assert table.header(0x10, length) == (
+                (0x10).to_bytes(t.tag_size, byteorder=t.endian) + t.encode_length(value)
+            )
+
+    def test_shared(self):
+        assert TLV().header_table() is TLV(indent=2).header_table()
+        assert TLV().header_table() is not TLV(len_size=2).header_table()
+
+    def test_settings_change(self, auto_len_tag):
+        auto_len_tag[0x01] = b"1"
+        auto_len_tag.tag_size = 2
+
+        assert auto_len_tag.to_byte_array() == b"\x00\x01\x01\x31"
+
+    def test_bounded(self, monkeypatch):
+        monkeypatch.setattr(HeaderTable, "MAX_HEADERS", 2)
+        table = HeaderTable(TLV())
+        for tag in range(5):
+            assert table.header(tag, 3) == bytes([tag, 3])
+
+        assert len(table.headers) == 2
+
+    def test_bounded_tags(self, monkeypatch):
+        monkeypatch.setattr(HeaderTable, "MAX_TAGS", 2)
+        table = HeaderTable(TLV(tag_size=None))
+        for tag in range(0x1F, 0x1F + 5):
+            assert table.tag(tag) == TLV(tag_size=None)._encode_tag(tag)
+
+        assert len(table.tags) == 2
+
+    def test_length_errors(self):
+        with pytest.raises(ValueError):
+            TLV(len_size=1).header_table().length(256)
@@ -0,0 +1,83 @@
+from uttlv import TLV, Int8, Int16
+from uttlv.infer import TagMapInference, TagStats, infer_tag_map
+
+CITIES = ["Lisbon", "Porto", "Braga", "Coimbra"]
+
+
+def make_message(i):
+    t = TLV()
+    t[0x0A] = i
+    t[0x0B] = CITIES[i % len(CITIES)]
+    t[0x0C] = TLV()
+    t[0x0C][0x01] = Int16(i)
+    t[0x0C][0x02] = CITIES[-i % len(CITIES)]
+    if i % 2:
+        t[0x0D] = b"\xff\xfe" * (1 + i % 3)
+    return t
+
+
+class TestInference:
+    """Test tag map inference from samples."""
+
+    def test_tag_map(self):
+        tag_map = infer_tag_map(make_message(i) for i in range(20))
+
+        assert tag_map == {
+            0x0A: {TLV.Config.Type: int},
+            0x0B: {TLV.Config.Type: str},
+            0x0C: {
+                TLV.Config.Type: {0x01: {TLV.Config.Type: Int16}, 0x02: {TLV.Config.Type: str}}
+            },
+            0x0D: {TLV.Config.Type: bytes},
+        }
+
+    def test_parse_with_inferred_map(self):
+        messages = [make_message(i) for i in range(20)]
+        tag_map = infer_tag_map(messages)
+        TLV.validate_tag_map(tag_map)
+        t = TLV()
+        t.set_local_tag_map(tag_map)
+        t.parse_array(messages[3].to_byte_array())
+
+        assert t[0x0A] == 3
+        assert t[0x0B] == "Coimbra"
+        assert t[0x0C][0x01] == 3
+        assert t[0x0C][0x02] == "Porto"
+
+    def test_type_precedence(self):
+        def infer(values):
+            stats = TagStats(0x01)
+            for value in values:
+                stats.add(value)
+            return stats.infer_type()
+
+        # Printable text wins over integers longer than one byte
+        assert infer([b"ABCD", b"EFGH"]) is str
+        assert infer([b"AB\x00D", b"EFGH"]) is int
+        assert infer([b"A", b"B"]) is Int8
+
+    def test_stats(self):
+        inference = TagMapInference()
+        inference.add_many(make_message(i) for i in range(20))
+        stats = inference.stats
+
+        assert inference.messages == 20
+        assert stats[0x0A].count == 20
+        assert stats[0x0A].fixed_length
+        assert stats[0x0B].min_length == 5
+        assert stats[0x0B].max_length == 7
+        assert stats[0x0C].nested == 20
+        assert stats[0x0C].children[0x02].messages == 20
+        assert stats[0x0D].messages == 10
+        assert stats[0x0D].mean_length == 4.0
+
+    def test_report(self):
+        inference = TagMapInference()
+        inference.add_many(make_message(i).to_byte_array() for i in range(4))
+        lines = inference.report().splitlines()
+
+        assert len(lines) == 7
+        assert lines[1].split() == ["0a", "int", "100%", "4", "4", "4", "4.0"]
+        assert lines[3].split()[:2] == ["0c", "nested"]
+        assert lines[4].startswith("  01")
+        assert lines[6].split()[:3] == ["0d", "bytes", "50%"]
@@ -0,0 +1,94 @@
+import pytest
+
+from uttlv import TLV, ParseLimits
+from uttlv.pool import TLVPool
+
+from .conftest import nested_tag_map
+
+
+def limited(**kwargs):
+    return TLV(limits=ParseLimits(**kwargs))
+
+
+class TestLimits:
+    """Test resource bounded parsing."""
+
+    def test_no_limits(self):
+        t = limited()
+        t.parse_array([0x20, 0x05, 0x01, 0x02])
+
+        assert t[0x20] == b"\x01\x02"
+
+    def test_max_bytes(self):
+        with pytest.raises(ValueError):
+            limited(max_bytes=3).parse_array([0x20, 0x02, 0x01, 0x02])
+        limited(max_bytes=4).parse_array([0x20, 0x02, 0x01, 0x02])
+
+    def test_max_value_length(self):
+        # Declared length is checked even if the data is shorter
+        with pytest.raises(ValueError):
+            limited(max_value_length=100).parse_array([0x20, 0x82, 0xFF, 0xFF, 0x01])
+
+    def test_max_fields(self):
+        arr = [0x20, 0x01, 0x00] * 3
+        with pytest.raises(ValueError):
+            limited(max_fields=2).parse_array(arr)
+        limited(max_fields=3).parse_array(arr)
+
+    def test_strict_truncated(self):
+        with pytest.raises(ValueError):
+            limited(strict=True).parse_array([0x20, 0x05, 0x01, 0x02])
+        with pytest.raises(ValueError):
+            limited(strict=True).parse_array([0x20, 0x01, 0x01, 0x21, 0x84, 0x00])
+
+    def test_strict_trailing(self):
+        with pytest.raises(ValueError):
+            limited(strict=True).parse_array([0x20, 0x01, 0x01, 0x21])
+
+    def test_strict_empty_last_value(self):
+        t = limited(strict=True)
+        t.parse_array([0x20, 0x01, 0x01, 0x21, 0x00])
+
+        assert t[0x21] == b""
+
+    def test_max_depth(self, nested_tag):
+        arr = nested_tag.to_byte_array()
+        shallow = limited(max_depth=1)
+        shallow.set_local_tag_map(nested_tag_map)
+        with pytest.raises(ValueError):
+            shallow.parse_array(arr)
+
+        deep = limited(max_depth=2)
+        deep.set_local_tag_map(nested_tag_map)
+        deep.parse_array(arr)
+        assert deep["FIRST_NEST"]["SECOND_NEST"]["LEAF"] == 1
+
+    def test_max_depth_pool(self, nested_tag):
+        arr = nested_tag.to_byte_array()
+        pool = TLVPool(limits=ParseLimits(max_depth=2))
+        pool.release(pool.parse(arr, nested_tag_map))
+
+        # Released children are reused as top level objects
+        for target in [pool.acquire() for _ in range(len(pool))]:
+            msg = pool.parse(arr, nested_tag_map, target=target)
+            assert msg["FIRST_NEST"]["SECOND_NEST"]["LEAF"] == 1
+
+    def test_recursive_tag_map(self):
+        tag_map = {0x01: {TLV.Config.Type: TLV}}
+        arr = b"\x01\x00"
+        for _ in range(50):
+            arr = b"\x01" + bytes([len(arr)]) + arr
+        old_map = TLV._global_tag_map
+        TLV.set_global_tag_map(tag_map)
+        try:
+            with pytest.raises(ValueError):
+                limited(max_depth=10).parse_array(arr)
+        finally:
+            TLV.set_global_tag_map(old_map)
+
+    def test_parse_file(self, tmp_path):
+        path = tmp_path / "message.bin"
+        path.write_bytes(bytes([0x20, 0x05, 0x01, 0x02]))
+
+        with pytest.raises(ValueError):
+            limited(strict=True).parse_file(path)
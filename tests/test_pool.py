@@ -0,0 +1,81 @@
+import pytest
+
+from uttlv import TLV
+from uttlv.pool import TLVPool
+
+from .conftest import nested_tag_map
+
+
+class TestPool:
+    """Test TLV reuse through clear, reset and pools."""
+
+    def test_clear(self, multi_tag):
+        tag_map = {0x01: {TLV.Config.Type: int}}
+        multi_tag.set_local_tag_map(tag_map)
+        multi_tag.clear()
+
+        assert list(multi_tag) == []
+        assert multi_tag.tag_map is tag_map
+        assert multi_tag.encoded_size() == 0
+
+    def test_reset(self, multi_tag):
+        multi_tag.set_local_tag_map({0x01: {TLV.Config.Type: int}})
+        multi_tag.reset()
+
+        assert list(multi_tag) == []
+        assert multi_tag.tag_map is TLV._global_tag_map
+
+    def test_acquire_release(self):
+        pool = TLVPool(maxsize=1)
+        first = pool.acquire()
+        second = pool.acquire()
+        first[0x01] = 1
+        pool.release(first)
+        pool.release(second)
+
+        assert len(pool) == 1
+        assert pool.acquire() is first
+        assert list(first) == []
+
+    def test_release_foreign(self):
+        with pytest.raises(ValueError):
+            TLVPool().release(TLV())
+
+    def test_settings(self):
+        tlv = TLVPool(len_size=2).acquire()
+
+        assert tlv.len_size == 2
+
+    def test_parse_reuses_children(self, nested_tag):
+        arr = nested_tag.to_byte_array()
+        pool = TLVPool()
+        msg = pool.parse(arr, nested_tag_map)
+        first = msg["FIRST_NEST"]
+        second = first["SECOND_NEST"]
+
+        for _ in range(3):
+            msg = pool.parse(arr, nested_tag_map, target=msg)
+            assert msg["FIRST_NEST"]["SECOND_NEST"]["LEAF"] == 1
+            assert msg["FIRST_NEST"] is first
+            assert msg["FIRST_NEST"]["SECOND_NEST"] is second
+            assert msg == nested_tag
+
+    def test_release_returns_children(self, nested_tag):
+        arr = nested_tag.to_byte_array()
+        pool = TLVPool()
+        msg = pool.parse(arr, nested_tag_map)
+        pool.release(msg)
+
+        assert len(pool) == 3
+        msg = pool.parse(arr, nested_tag_map)
+        assert len(pool) == 0
+        assert msg["FIRST_NEST"]["SECOND_NEST"]["LEAF"] == 1
+
+    def test_scalars_allocate_no_tlv(self, nested_tag, monkeypatch):
+        arr = nested_tag.to_byte_array()
+        pool = TLVPool()
+        msg = pool.parse(arr, nested_tag_map)
+        monkeypatch.setattr(TLV, "__init__", None)
+
+        msg = pool.parse(arr, nested_tag_map, target=msg)
+        assert msg["FIRST_NEST"]["SECOND_NEST"]["LEAF"] == 1
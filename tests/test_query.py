@@ -0,0 +1,113 @@
+import pytest
+
+from uttlv import TLV
+from uttlv.query import compile_path
+from uttlv.registry import TagMapRegistry
+
+from .conftest import nested_tag_map
+
+
+def make_entry(ident, name):
+    t = TLV()
+    t[0x01] = ident
+    t[0x02] = name
+    return t.to_byte_array()
+
+
+entry_tag_map = {
+    0x01: {TLV.Config.Type: int, TLV.Config.Name: "ID"},
+    0x02: {TLV.Config.Type: str, TLV.Config.Name: "NAME"},
+}
+
+list_tag_map = {
+    0x10: {
+        TLV.Config.Name: "LIST",
+        TLV.Config.Type: {0x20: {TLV.Config.Name: "ENTRY", TLV.Config.Type: entry_tag_map}},
+    },
+}
+
+
+def make_field(tag, value):
+    return bytes([tag, len(value)]) + value
+
+
+@pytest.fixture(scope="function")
+def repeated():
+    """LIST holding two ENTRY children and an unmapped 0x21 child."""
+    body = (
+        make_field(0x20, make_entry(1, "one"))
+        + make_field(0x20, make_entry(2, "two"))
+        + make_field(0x21, make_field(0x01, b"\x03"))
+    )
+    return make_field(0x10, body)
+
+
+class TestQuery:
+    """Test compiled path queries."""
+
+    def test_nested_names(self, nested_tag):
+        arr = nested_tag.to_byte_array()
+        query = compile_path("FIRST_NEST/SECOND_NEST/LEAF", nested_tag_map)
+
+        assert query.find(arr) == 1
+        assert compile_path([1, 1, 1], nested_tag_map).find(arr) == 1
+        assert compile_path("NON_NESTED_DATA", nested_tag_map).find(arr) == 42
+
+    def test_handle(self, nested_tag):
+        handle = TagMapRegistry().register("nested", nested_tag_map)
+        query = compile_path("FIRST_NEST/SECOND_NEST/LEAF", handle)
+
+        assert query.find(nested_tag.to_byte_array()) == 1
+
+    def test_raw(self, nested_tag):
+        arr = nested_tag.to_byte_array()
+        value = compile_path("FIRST_NEST/SECOND_NEST", nested_tag_map).find(arr, raw=True)
+
+        assert isinstance(value, memoryview)
+        assert bytes(value) == b"\x01\x04\x00\x00\x00\x01"
+
+    def test_nested_value(self, nested_tag):
+        arr = nested_tag.to_byte_array()
+        value = compile_path("FIRST_NEST/SECOND_NEST", nested_tag_map).find(arr)
+
+        assert isinstance(value, TLV)
+        assert value["LEAF"] == 1
+
+    def test_missing(self, nested_tag):
+        arr = nested_tag.to_byte_array()
+
+        assert compile_path("FIRST_NEST/0x05", nested_tag_map).find(arr, default=-1) == -1
+        assert compile_path("FIRST_NEST/0x05", nested_tag_map).find_all(arr) == []
+        with pytest.raises(KeyError):
+            compile_path("FIRST_NEST/UNKNOWN", nested_tag_map).find(arr)
+
+    def test_repeated(self, repeated):
+        query = compile_path("LIST/ENTRY/NAME", list_tag_map)
+
+        assert query.find(repeated) == "one"
+        assert query.find_all(repeated) == ["one", "two"]
+
+    def test_wildcard(self, repeated):
+        query = compile_path("LIST/*/0x01", list_tag_map)
+
+        values = query.find_all(repeated, raw=True)
+
+        assert [bytes(v) for v in values] == [bytes([0, 0, 0, 1]), bytes([0, 0, 0, 2]), b"\x03"]
+
+    def test_names_per_tag_map(self):
+        tag_map = {
+            0x10: {TLV.Config.Type: {0x01: {TLV.Config.Name: "KEY", TLV.Config.Type: int}}},
+            0x11: {TLV.Config.Type: {0x02: {TLV.Config.Name: "KEY", TLV.Config.Type: str}}},
+        }
+        data = make_field(0x10, make_field(0x01, bytes([0, 0, 0, 7]))) + make_field(
+            0x11, make_field(0x02, b"seven")
+        )
+        query = compile_path("*/KEY", tag_map)
+
+        for _ in range(2):
+            assert query.find_all(data) == [7, "seven"]
+        assert len(query._resolved) == 2
+
+    def test_empty_path(self):
+        with pytest.raises(ValueError):
+            compile_path("/")
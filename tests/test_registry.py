@@ -0,0 +1,173 @@
+import copy
+import pickle
+import threading
+
+import pytest
+
+from uttlv import TLV
+from uttlv.diff import diff
+from uttlv.query import compile_path
+from uttlv.registry import TagMapRegistry
+
+from .conftest import nested_tag_map
+
+DATA = bytes.fromhex("010400000005" "02026869")
+
+
+@pytest.fixture(scope="function")
+def registry():
+    yield TagMapRegistry()
+
+
+@pytest.fixture(scope="function")
+def global_handle(registry):
+    old_map = TLV._global_tag_map
+    handle = registry.register(
+        "global",
+        {0x01: {TLV.Config.Name: "A", TLV.Config.Type: TLV}, 0x02: {TLV.Config.Type: int}},
+    )
+    TLV.set_global_tag_map(handle)
+    yield handle
+    TLV.set_global_tag_map(old_map)
+
+
+def make_nested(value=5):
+    t = TLV()
+    t[0x01] = TLV()
+    t[0x01][0x02] = value
+    return t
+
+
+class TestRegistry:
+    """Test the versioned tag map registry."""
+
+    def test_register(self, registry):
+        handle = registry.register("feed", {0x01: {TLV.Config.Type: int}})
+
+        assert "feed" in registry
+        assert registry["feed"] is handle
+        assert handle.version == 1
+        assert handle.tag_map[0x01][TLV.Config.Type] is int
+        with pytest.raises(TypeError):
+            handle.tag_map[0x02] = {}
+        with pytest.raises(TypeError):
+            handle.tag_map[0x01][TLV.Config.Type] = str
+
+    def test_register_copies(self, registry):
+        tag_map = {0x01: {TLV.Config.Type: int}}
+        handle = registry.register("feed", tag_map)
+        tag_map[0x01][TLV.Config.Type] = str
+
+        assert handle.tag_map[0x01][TLV.Config.Type] is int
+
+    def test_validation(self, registry):
+        with pytest.raises(AttributeError):
+            registry.register("feed", {0x01: {TLV.Config.Type: float}})
+        with pytest.raises(AttributeError):
+            registry.register("feed", {0x01: {TLV.Config.Type: {0x02: {TLV.Config.Type: list}}}})
+        with pytest.raises(TypeError):
+            registry.register("feed", {0x01: int})
+        assert "feed" not in registry
+
+    def test_parse_with_handle(self, registry):
+        handle = registry.register("feed", {0x01: {TLV.Config.Type: int}})
+        t = TLV()
+        t.set_local_tag_map(handle)
+        t.parse_array(DATA)
+
+        assert t[0x01] == 5
+        assert t[0x02] == b"hi"
+
+    def test_swap(self, registry):
+        handle = registry.register("feed", {0x01: {TLV.Config.Type: int}})
+        t = TLV()
+        t.set_local_tag_map(handle)
+
+        assert registry.swap("feed", {0x02: {TLV.Config.Type: str}}) == 2
+        assert handle.version == 2
+        t.parse_array(DATA)
+        assert t[0x01] == b"\x00\x00\x00\x05"
+        assert t[0x02] == "hi"
+        with pytest.raises(KeyError):
+            registry.swap("other", {})
+
+    def test_nested(self, registry):
+        handle = registry.register("nested", nested_tag_map)
+        source = TLV()
+        source[0x01] = TLV()
+        source[0x01][0x01] = TLV()
+        source[0x01][0x01][0x01] = 7
+        t = TLV()
+        t.set_local_tag_map(handle)
+        t.parse_array(source.to_byte_array())
+
+        assert t[0x01][0x01][0x01] == 7
+        assert t[0x01].tag_map is handle.tag_map[0x01][TLV.Config.Type]
+
+    def test_concurrent_swaps(self, registry):
+        maps = [{0x01: {TLV.Config.Type: int}}, {0x01: {TLV.Config.Type: bytes}}]
+        handle = registry.register("feed", maps[0])
+        errors = []
+
+        def parse():
+            for _ in range(200):
+                t = TLV()
+                t.set_local_tag_map(handle)
+                t.parse_array(DATA)
+                if t[0x01] not in (5, b"\x00\x00\x00\x05"):
+                    errors.append(t[0x01])
+
+        threads = [threading.Thread(target=parse) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for i in range(200):
+            registry.register("feed", maps[i % 2])
+        for thread in threads:
+            thread.join()
+
+        assert not errors
+        assert handle.version == 201
+
+    def test_global_handle(self, registry):
+        handle = registry.register("feed", {0x01: {TLV.Config.Type: int}})
+        old_map = TLV._global_tag_map
+        TLV.set_global_tag_map(handle)
+        try:
+            t = TLV()
+            t.parse_array(DATA)
+            assert t[0x01] == 5
+            assert t.tag_map is handle.tag_map
+        finally:
+            TLV.set_global_tag_map(old_map)
+
+    def test_global_handle_query(self, global_handle):
+        arr = make_nested().to_byte_array()
+
+        assert compile_path("A/2").find(arr) == 5
+        assert TLV.global_tag_map() is global_handle.tag_map
+
+    def test_global_handle_diff(self, global_handle):
+        result = diff(make_nested().to_byte_array(), make_nested(6).to_byte_array())
+
+        assert result.changed == [(0x01, 0x02)]
+
+    def test_read_only(self, registry):
+        handle = registry.register("feed", {0x01: {TLV.Config.Type: int}})
+
+        with pytest.raises(TypeError):
+            handle.tag_map[0x02] = {}
+        with pytest.raises(TypeError):
+            handle.tag_map[0x01][TLV.Config.Type] = str
+
+    def test_pickle(self, registry):
+        handle = registry.register(
+            "feed", {0x01: {TLV.Config.Type: int}, 0x02: {TLV.Config.Type: str}}
+        )
+        t = TLV()
+        t.set_local_tag_map(handle)
+        t.parse_array(DATA)
+
+        for copied in (pickle.loads(pickle.dumps(t)), copy.deepcopy(t), t.freeze()):
+            assert copied.to_byte_array() == DATA
+            assert copied.tag_map == handle.tag_map
+        assert pickle.loads(pickle.dumps(t.freeze())) == t
@@ -0,0 +1,142 @@
+import multiprocessing
+import queue
+
+import pytest
+
+from uttlv import TLV
+from uttlv import shm
+from uttlv.registry import TagMapRegistry
+from uttlv.shm import SharedRing, TLVView, shared_memory
+
+from .conftest import nested_tag_map
+
+# Tags outside the global tag map of conftest
+TAG_MAP = {0x0A: {TLV.Config.Type: int, TLV.Config.Name: "COUNT"}}
+
+
+def make_message(count):
+    t = TLV()
+    t[0x0A] = count
+    t[0x0B] = b"payload"
+    return t
+
+
+@pytest.fixture(scope="function")
+def ring():
+    with SharedRing(size=256, create=True) as ring:
+        yield ring
+
+
+def produce(ring, batches):
+    for i in range(batches):
+        ring.put([make_message(i), make_message(i + 1)])
+    ring.close()
+
+
+class TestTLVView:
+    """Test lazy read-only views."""
+
+    def test_view(self):
+        data = make_message(5).to_byte_array()
+        view = TLVView(data, tag_map=TAG_MAP)
+
+        assert len(view) == 2
+        assert 0x0B in view
+        assert "COUNT" in view
+        assert view["COUNT"] == 5
+        assert view[0x0B] == b"payload"
+        assert bytes(view.raw(0x0A)) == b"\x00\x00\x00\x05"
+        assert view.to_byte_array() == data
+        assert view.to_tlv() == make_message(5)
+        with pytest.raises(TypeError):
+            view[0x0A] = 1
+
+    def test_handle(self):
+        handle = TagMapRegistry().register("messages", TAG_MAP)
+        view = TLVView(make_message(5).to_byte_array(), tag_map=handle)
+
+        assert view["COUNT"] == 5
+
+    def test_nested(self):
+        t = TLV()
+        t[0x01] = TLV()
+        t[0x01][0x01] = TLV()
+        t[0x01][0x01][0x01] = 7
+        view = TLVView(t.to_byte_array(), tag_map=nested_tag_map)
+
+        assert isinstance(view[0x01], TLVView)
+        assert view["FIRST_NEST"]["SECOND_NEST"]["LEAF"] == 7
+
+    def test_global_handle(self):
+        handle = TagMapRegistry().register(
+            "global",
+            {
+                0x01: {TLV.Config.Name: "A", TLV.Config.Type: TLV},
+                0x02: {TLV.Config.Name: "B", TLV.Config.Type: int},
+            },
+        )
+        t = TLV()
+        t[0x01] = TLV()
+        t[0x01][0x02] = 7
+        old_map = TLV._global_tag_map
+        TLV.set_global_tag_map(handle)
+        try:
+            assert TLVView(t.to_byte_array())["A"]["B"] == 7
+        finally:
+            TLV.set_global_tag_map(old_map)
+
+
+class TestSharedRingSupport:
+    """Test rings where shared memory is missing."""
+
+    def test_unsupported(self, monkeypatch):
+        monkeypatch.setattr(shm, "shared_memory", None)
+
+        with pytest.raises(RuntimeError, match="Python 3.8"):
+            SharedRing(create=True)
+
+
+@pytest.mark.skipif(shared_memory is None, reason="shared memory needs Python 3.8 or later")
+class TestSharedRing:
+    """Test the shared memory ring."""
+
+    def test_put_get(self, ring):
+        ring.put([make_message(1), make_message(2).to_byte_array()])
+
+        with ring.get(tag_map=TAG_MAP) as batch:
+            assert len(batch) == 2
+            assert [view["COUNT"] for view in batch] == [1, 2]
+            assert batch[1][0x0B] == b"payload"
+        with pytest.raises(ValueError):
+            batch[0][0x0B]
+
+    def test_empty_and_full(self, ring):
+        with pytest.raises(queue.Empty):
+            ring.get(block=False)
+        with pytest.raises(queue.Empty):
+            ring.get(timeout=0.01)
+        # Entries of 64 bytes
+        for i in range(4):
+            ring.put([make_message(i)] * 3, block=False)
+        with pytest.raises(queue.Full):
+            ring.put([make_message(0)] * 3, block=False)
+        with pytest.raises(ValueError):
+            ring.put([make_message(0)] * 20)
+
+    def test_wrap_around(self, ring):
+        for i in range(50):
+            ring.put([make_message(i)] * (1 + i % 3))
+            with ring.get(tag_map=TAG_MAP) as batch:
+                assert len(batch) == 1 + i % 3
+                assert all(view["COUNT"] == i for view in batch)
+
+    def test_processes(self, ring):
+        producer = multiprocessing.Process(target=produce, args=(ring, 100))
+        producer.start()
+        counts = []
+        for _ in range(100):
+            with ring.get(timeout=10, tag_map=TAG_MAP) as batch:
+                counts.append([view["COUNT"] for view in batch])
+        producer.join()
+
+        assert counts == [[i, i + 1] for i in range(100)]
@@ -0,0 +1,51 @@
+import pytest
+
+from uttlv import TLV, EmptyTLV, Int8, Int16, Int64
+
+
+class TestEncodedSize:
+    """Test encoded size computation."""
+
+    def test_empty(self, tag):
+        assert tag.encoded_size() == 0
+        assert EmptyTLV(0x01, len_size=2).encoded_size() == 3
+
+    def test_values(self, tag, auto_len_tag):
+        for t in (tag, auto_len_tag):
+            t[0x01] = 10
+            t[0x02] = Int8(1)
+            t[0x03] = Int16(2)
+            t[0x04] = Int64(3)
+            t[0x05] = "teste"
+            t[0x06] = "maçã"
+            t[0x07] = bytes(300)
+            t[0x08] = bytes(2**16 - 1)
+
+            assert t.encoded_size() == len(t.to_byte_array())
+
+    def test_nested(self, multi_tag, nested_tag):
+        multi_tag[0x09] = nested_tag
+
+        assert multi_tag.encoded_size() == len(multi_tag.to_byte_array())
+        assert multi_tag.freeze().encoded_size() == len(multi_tag.to_byte_array())
+
+    def test_cache_invalidation(self, auto_len_tag):
+        child = TLV()
+        child[0x01] = b"1"
+        auto_len_tag[0x01] = b"12"
+        auto_len_tag[0x02] = child
+        assert auto_len_tag.encoded_size() == 9
+
+        auto_len_tag[0x01] = bytes(200)
+        assert auto_len_tag.encoded_size() == 208
+        child[0x02] = b"2"
+        assert auto_len_tag.encoded_size() == 211
+        auto_len_tag.tag_size = 2
+        assert auto_len_tag.encoded_size() == len(auto_len_tag.to_byte_array())
+
+    def test_oversized(self, auto_len_tag):
+        t = TLV(len_size=1)
+        t[0x01] = bytes(256)
+
+        with pytest.raises(ValueError):
+            t.encoded_size()
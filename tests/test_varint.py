@@ -0,0 +1,56 @@
+import pytest
+
+from uttlv import TLV, EmptyTLV
+from uttlv.tlv import VARINT
+
+
+@pytest.fixture(scope="function")
+def varint_tag():
+    yield TLV(len_size=VARINT)
+
+
+class TestVarintLengths:
+    """Test LEB128 length fields."""
+
+    @pytest.mark.parametrize(
+        "length, field",
+        [
+            (0, "00"),
+            (1, "01"),
+            (127, "7f"),
+            (128, "8001"),
+            (300, "ac02"),
+            (16383, "ff7f"),
+            (16384, "808001"),
+        ],
+    )
+    def test_encode_length(self, varint_tag, length, field):
+        assert varint_tag.encode_length(bytes(length)) == bytes.fromhex(field)
+        assert varint_tag.len_field_size(length) == len(field) // 2
+
+    @pytest.mark.parametrize("length", [0, 5, 127, 128, 300, 70000])
+    def test_round_trip(self, varint_tag, length):
+        varint_tag[0x0A] = bytes(length)
+        varint_tag[0x0B] = b"end"
+        arr = varint_tag.to_byte_array()
+        t = TLV(len_size=VARINT)
+        t.parse_array(arr)
+
+        assert len(arr) == varint_tag.encoded_size()
+        assert t[0x0A] == bytes(length)
+        assert t[0x0B] == b"end"
+
+    def test_decode_header(self, varint_tag):
+        assert varint_tag.decode_header(bytes.fromhex("0aac02")) == (0x0A, 300, 3)
+        with pytest.raises(ValueError):
+            varint_tag.decode_header(bytes.fromhex("0a8080"))
+
+    def test_empty(self):
+        assert EmptyTLV(0x0A, len_size=VARINT).to_byte_array() == b"\x0a\x00"
+
+    def test_smaller_than_ber(self, varint_tag):
+        ber = TLV()
+        for t in (varint_tag, ber):
+            t[0x0A] = bytes(300)
+
+        assert len(varint_tag.to_byte_array()) == len(ber.to_byte_array()) - 1
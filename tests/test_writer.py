@@ -0,0 +1,84 @@
+import os
+import socket
+import threading
+
+from uttlv import TLV
+from uttlv.writer import _write_all, write_message, write_messages
+
+
+def make_message(i):
+    t = TLV()
+    t[0x01] = i
+    t[0x02] = bytes([i % 256]) * 10
+    child = TLV()
+    child[0x03] = "child"
+    t[0x04] = child
+    return t
+
+
+class TestWriter:
+    """Test vectored writes."""
+
+    def test_to_buffers(self, auto_len_tag):
+        value = bytes(300)
+        auto_len_tag[0x01] = value
+        auto_len_tag[0x02] = make_message(1)
+        buffers = auto_len_tag.to_buffers()
+
+        assert any(buf is value for buf in buffers)
+        assert b"".join(buffers) == auto_len_tag.to_byte_array()
+
+    def test_file(self, tmp_path):
+        messages = [make_message(i) for i in range(100)]
+        path = tmp_path / "out.bin"
+        with open(path, "wb") as f:
+            f.write(b"head")
+            written = write_messages(f, messages, max_buffers=7)
+
+        exp = b"".join(m.to_byte_array() for m in messages)
+        assert written == len(exp)
+        assert path.read_bytes() == b"head" + exp
+
+    def test_fd(self, tmp_path):
+        fd = os.open(tmp_path / "out.bin", os.O_WRONLY | os.O_CREAT)
+        try:
+            write_message(fd, make_message(1))
+            write_message(fd, b"raw")
+        finally:
+            os.close(fd)
+
+        assert (tmp_path / "out.bin").read_bytes() == make_message(1).to_byte_array() + b"raw"
+
+    def test_socket(self):
+        messages = [make_message(i) for i in range(2000)]
+        messages[10][0x05] = bytes(2**20)
+        exp = b"".join(m.to_byte_array() for m in messages)
+        left, right = socket.socketpair()
+        received = bytearray()
+
+        def reader():
+            while len(received) < len(exp):
+                received.extend(right.recv(65536))
+
+        thread = threading.Thread(target=reader)
+        thread.start()
+        try:
+            write_messages(left, messages)
+            thread.join()
+        finally:
+            left.close()
+            right.close()
+
+        assert bytes(received) == exp
+
+    def test_partial_writes(self):
+        out = bytearray()
+
+        def write(buffers):
+            # Write at most 3 bytes per call
+            data = b"".join(buffers)[:3]
+            out.extend(data)
+            return len(data)
+
+        assert _write_all(write, [b"abcd", b"", b"ef", b"ghijk"]) == 11
+        assert bytes(out) == b"abcdefghijk"
@@ -11,7 +11,8 @@ from .encoder import (
     Utf16Encoder,
     Utf32Encoder,
 )
-from .tlv import TLV, EmptyTLV, Int8, Int16, Int64
+from .fileslice import FileSlice
+from .tlv import TLV, Checksum, EmptyTLV, FrozenTLV, Int8, Int16, Int64, ParseLimits
 
 # Package version
 __version__ = "0.7.0"
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import bisect
+from typing import Any, Iterator, List, Tuple
+
+from .tlv import TLV
+
+# A message is canonical when the tags of each level are strictly ascending,
+# as written by to_byte_array(canonical=True).
+
+
+def _check_order(tags: List[int]) -> None:
+    for i in range(1, len(tags)):
+        if tags[i] <= tags[i - 1]:
+            raise ValueError(f"Tag {tags[i]:#x} out of canonical order at field {i}")
+
+
+class OffsetTable:
+    """Sorted table of the fields of an encoded canonical message.
+
+    The headers are walked once when the table is built. A tag is then
+    located by binary search, without reading the message again.
+    """
+
+    def __init__(
+        self, data: Any[bytes, memoryview], codec: TLV = None, start: int = 0, end: int = None
+    ):
+        """
+        :args:
+            data: encoded canonical message.
+            codec: TLV object holding the settings, a default TLV() if None.
+            start, end: region of data holding the fields, all of it by
+                default. Use the value offset and length of a nested field
+                to index it.
+        """
+        self.codec = TLV() if codec is None else codec
+        self.data = data
+        self.tags = []
+        self.offsets = []
+        self.lengths = []
+        for tag, offset, length in self.codec.iter_fields(data, start, end):
+            self.tags.append(tag)
+            self.offsets.append(offset)
+            self.lengths.append(length)
+        _check_order(self.tags)
+
+    def __len__(self):
+        return len(self.tags)
+
+    def __contains__(self, tag: int) -> bool:
+        return self.index(tag) is not None
+
+    def __iter__(self) -> Iterator[Tuple[int, int, int]]:
+        return zip(self.tags, self.offsets, self.lengths)
+
+    def index(self, tag: int) -> Any[int, None]:
+        """Return the position of tag in the table, None if missing."""
+        i = bisect.bisect_left(self.tags, tag)
+        if i < len(self.tags) and self.tags[i] == tag:
+            return i
+        return None
+
+    def find(self, tag: int) -> Any[Tuple[int, int], None]:
+        """Return the (offset, length) of the value of tag, None if missing."""
+        i = self.index(tag)
+        if i is None:
+            return None
+        return self.offsets[i], self.lengths[i]
+
+    def value(self, tag: int) -> Any[memoryview, None]:
+        """Return the raw value of tag without copying it, None if missing."""
+        i = self.index(tag)
+        if i is None:
+            return None
+        offset = self.offsets[i]
+        return memoryview(self.data)[offset : offset + self.lengths[i]]
+
+    def nested(self, tag: int) -> OffsetTable:
+        """Return the table of the nested message held by tag."""
+        i = self.index(tag)
+        if i is None:
+            raise KeyError(f"Key {tag} not found")
+        offset = self.offsets[i]
+        return OffsetTable(self.data, self.codec, offset, offset + self.lengths[i])
+
+
+def is_canonical(data: Any[bytes, memoryview], codec: TLV = None) -> bool:
+    """Check if the top level tags of an encoded message are ascending."""
+    try:
+        OffsetTable(data, codec)
+    except ValueError:
+        return False
+    return True
+
+
+def _fields(codec: TLV, data: memoryview) -> Iterator[Tuple[int, memoryview]]:
+    """Iterate over (tag, whole field) pairs, header included."""
+    pos = 0
+    for tag, offset, length in codec.iter_fields(data):
+        yield tag, data[pos : offset + length]
+        pos = offset + length
+
+
+def merge(
+    first: Any[bytes, memoryview], second: Any[bytes, memoryview], codec: TLV = None
+) -> bytes:
+    """Merge two encoded canonical messages into one canonical message.
+
+    The fields of both messages are interleaved in a single pass and copied
+    as they are, without decoding or encoding values. When both messages
+    hold a tag, the field of second wins.
+
+    :args:
+        first, second: encoded canonical messages.
+        codec: TLV object holding the settings, a default TLV() if None.
+    """
+    codec = TLV() if codec is None else codec
+    left = _fields(codec, memoryview(first))
+    right = _fields(codec, memoryview(second))
+    out = []
+    left_field = next(left, None)
+    right_field = next(right, None)
+    last = None
+    while left_field is not None or right_field is not None:
+        if right_field is None or (left_field is not None and left_field[0] < right_field[0]):
+            tag, field = left_field
+            left_field = next(left, None)
+        else:
+            tag, field = right_field
+            if left_field is not None and left_field[0] == tag:
+                left_field = next(left, None)
+            right_field = next(right, None)
+        if last is not None and tag <= last:
+            raise ValueError(f"Tag {tag:#x} out of canonical order")
+        last = tag
+        out.append(field)
+    return b"".join(out)
@@ -0,0 +1,195 @@
+"""Command line decoder and parse profiler.
+
+    python -m uttlv [options] [file ...]
+
+Records are read from the given files, or stdin, as hex text (one record
+per line) or binary data (one record per file, or length prefixed records
+with --framed). Each record is printed with TLV.tree(), or timed with
+--profile.
+"""
+from __future__ import annotations
+
+import argparse
+import cProfile
+import io
+import json
+import pstats
+import sys
+import time
+from binascii import hexlify, unhexlify
+from typing import Any, Dict, Iterator, List
+
+from .framing import iter_frames
+from .tlv import TLV, VARINT, Int8, Int16, Int64
+
+# Type names accepted in tag map files
+TYPE_NAMES = {
+    "tlv": TLV,
+    "int8": Int8,
+    "int16": Int16,
+    "int": int,
+    "int32": int,
+    "int64": Int64,
+    "bytes": bytes,
+    "str": str,
+}
+
+
+def load_tag_map(config: Dict) -> Dict:
+    """Build a tag map from its JSON form.
+
+    Keys are tags as strings ("0x9f02" or "12"), values are objects with
+    optional "name" and "type" entries. A type is one of TYPE_NAMES, or a
+    nested JSON tag map.
+    """
+    tag_map = {}
+    for key, entry in config.items():
+        tag_config = {}
+        if "name" in entry:
+            tag_config[TLV.Config.Name] = entry["name"]
+        if "type" in entry:
+            tg_type = entry["type"]
+            if isinstance(tg_type, dict):
+                tag_config[TLV.Config.Type] = load_tag_map(tg_type)
+            elif tg_type in TYPE_NAMES:
+                tag_config[TLV.Config.Type] = TYPE_NAMES[tg_type]
+            else:
+                raise ValueError(f"Invalid type {tg_type} for tag {key}")
+        tag_map[int(key, 0)] = tag_config
+    return tag_map
+
+
+def _read_input(name: str, binary: bool) -> Any[bytes, str]:
+    if name == "-":
+        return sys.stdin.buffer.read() if binary else sys.stdin.read()
+    with open(name, "rb" if binary else "r") as f:
+        return f.read()
+
+
+def iter_records(names: List[str], binary: bool = False, framed: bool = False) -> Iterator[bytes]:
+    """Iterate over the encoded records of the input files, "-" for stdin."""
+    for name in names:
+        if binary:
+            data = _read_input(name, binary)
+            if framed:
+                yield from (bytes(record) for record in iter_frames(data))
+            else:
+                yield data
+            continue
+        text = _read_input(name, binary)
+        if framed:
+            yield from (bytes(record) for record in iter_frames(unhexlify("".join(text.split()))))
+            continue
+        for line in text.splitlines():
+            line = "".join(line.split())
+            if line and not line.startswith("#"):
+                yield unhexlify(line)
+
+
+def _size_option(value: str, names: Dict[str, Any]) -> Any[int, str, None]:
+    return names[value] if value in names else int(value)
+
+
+def make_codec(args: argparse.Namespace) -> TLV:
+    """Create the TLV object holding the settings given on the command line."""
+    codec = TLV(
+        tag_size=_size_option(args.tag_size, {"ber": None}),
+        len_size=_size_option(args.len_size, {"auto": None, "varint": VARINT}),
+        endian=args.endian,
+    )
+    if args.tag_map:
+        with open(args.tag_map) as f:
+            codec.set_local_tag_map(load_tag_map(json.load(f)))
+    return codec
+
+
+def _new_record(codec: TLV) -> TLV:
+    tlv = TLV(codec.indent, codec.tag_size, codec.len_size, codec.endian)
+    if codec._local_tag_map is not None:
+        tlv.set_local_tag_map(codec._local_tag_map)
+    return tlv
+
+
+def decode(records: List[bytes], codec: TLV, use_names: bool, out) -> None:
+    for index, record in enumerate(records):
+        tlv = _new_record(codec)
+        tlv.parse_array(record)
+        out.write(f"# record {index}, {len(record)} bytes\n")
+        out.write(tlv.tree(use_names=use_names).replace("\r\n", "\n"))
+
+
+def tag_shares(records: List[bytes], codec: TLV) -> Dict[int, int]:
+    """Return the bytes taken by each top level tag, headers included."""
+    shares = {}
+    for record in records:
+        pos = 0
+        for tag, offset, length in codec.iter_fields(record):
+            shares[tag] = shares.get(tag, 0) + offset + length - pos
+            pos = offset + length
+    return shares
+
+
+def profile(records: List[bytes], codec: TLV, repeat: int, top: int, out) -> None:
+    """Time parse_array() over the records and report where time goes."""
+    total_bytes = sum(len(record) for record in records) * repeat
+
+    def run():
+        for _ in range(repeat):
+            for record in records:
+                _new_record(codec).parse_array(record)
+
+    start = time.perf_counter()
+    run()
+    elapsed = time.perf_counter() - start
+    count = len(records) * repeat
+    out.write(f"{count} records, {total_bytes} bytes in {elapsed:.3f} s\n")
+    if elapsed > 0:
+        out.write(f"{count / elapsed:.0f} records/s, {total_bytes / elapsed / 1e6:.2f} MB/s\n")
+
+    shares = tag_shares(records, codec)
+    share_total = sum(shares.values()) or 1
+    out.write("\ntag bytes share\n")
+    for tag, size in sorted(shares.items(), key=lambda item: item[1], reverse=True):
+        encoded_tag = str(hexlify(codec.header_table().tag(tag)), "ascii")
+        out.write(f"{encoded_tag} {size * repeat} {100 * size / share_total:.1f}%\n")
+
+    profiler = cProfile.Profile()
+    profiler.runcall(run)
+    stream = io.StringIO()
+    pstats.Stats(profiler, stream=stream).sort_stats("tottime").print_stats(top)
+    out.write("\n" + stream.getvalue())
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="uttlv", description="Decode TLV records and profile their parsing."
+    )
+    parser.add_argument("files", nargs="*", default=["-"], help="input files, - for stdin")
+    parser.add_argument("-b", "--binary", action="store_true", help="binary input, not hex")
+    parser.add_argument(
+        "--framed", action="store_true", help="records prefixed by a 4 bytes length"
+    )
+    parser.add_argument("--tag-size", default="1", help="tag size in bytes, or ber")
+    parser.add_argument("--len-size", default="auto", help="length size in bytes, auto or varint")
+    parser.add_argument("--endian", choices=("big", "little"), default="big")
+    parser.add_argument("-m", "--tag-map", help="JSON tag map file")
+    parser.add_argument("-n", "--names", action="store_true", help="print tag names")
+    parser.add_argument("--profile", action="store_true", help="time parsing instead")
+    parser.add_argument("--repeat", type=int, default=1, help="parses per record to profile")
+    parser.add_argument("--top", type=int, default=20, help="profile entries to print")
+    return parser
+
+
+def main(argv: List[str] = None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        codec = make_codec(args)
+        records = list(iter_records(args.files, args.binary, args.framed))
+        if args.profile:
+            profile(records, codec, args.repeat, args.top, sys.stdout)
+        else:
+            decode(records, codec, args.names, sys.stdout)
+    except (OSError, ValueError, TypeError, AttributeError) as e:
+        print(f"uttlv: {e}", file=sys.stderr)
+        return 1
+    return 0
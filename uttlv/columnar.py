@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+from array import array
+from typing import Any, Dict, Iterable, Optional
+
+from .registry import TagMapHandle, resolve_tag_map
+from .tlv import ALLOWED_TYPES, TLV, Int8, Int16, Int64
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover - numpy is optional
+    numpy = None
+
+
+# Array typecodes used for integer columns, matching each encoder width
+INT_TYPECODES = {
+    Int8: "B",
+    Int16: "H",
+    int: "I",
+    Int64: "Q",
+}
+
+
+def _to_array(values: array):
+    """Expose an array.array as a NumPy array when NumPy is installed."""
+    if numpy is None:
+        return values
+    return numpy.frombuffer(values, dtype=values.typecode)
+
+
+class Column:
+    """Base class for a decoded column.
+
+    The validity mask holds one entry per record, 1 if the tag was present in
+    that record and 0 otherwise.
+    """
+
+    def __init__(self, tag: int, tag_type):
+        self.tag = tag
+        self.tag_type = tag_type
+        self._valid = array("B")
+
+    @property
+    def valid(self):
+        if numpy is None:
+            return self._valid
+        return numpy.frombuffer(self._valid, dtype=numpy.bool_)
+
+    def __len__(self):
+        return len(self._valid)
+
+
+class FixedColumn(Column):
+    """Column of integer values. Missing values are stored as 0."""
+
+    def __init__(self, tag: int, tag_type):
+        super().__init__(tag, tag_type)
+        self._values = array(INT_TYPECODES[tag_type])
+        # Size in bytes of the values the column can hold
+        self.width = self._values.itemsize
+
+    @property
+    def values(self):
+        return _to_array(self._values)
+
+    def append(self, value: Optional[int]):
+        if value is None:
+            self._values.append(0)
+            self._valid.append(0)
+        else:
+            self._values.append(value)
+            self._valid.append(1)
+
+    def __getitem__(self, index: int):
+        if not self._valid[index]:
+            return None
+        return self._values[index]
+
+
+class VarColumn(Column):
+    """Column of variable sized values.
+
+    Values are stored back to back in data, value i being
+    data[offsets[i]:offsets[i + 1]]. Missing values are empty.
+    """
+
+    def __init__(self, tag: int, tag_type):
+        super().__init__(tag, tag_type)
+        self._offsets = array("q", (0,))
+        self.data = bytearray()
+
+    @property
+    def offsets(self):
+        return _to_array(self._offsets)
+
+    def append(self, value: Optional[bytes]):
+        if value is None:
+            self._valid.append(0)
+        else:
+            self.data += value
+            self._valid.append(1)
+        self._offsets.append(len(self.data))
+
+    def __getitem__(self, index: int):
+        if not self._valid[index]:
+            return None
+        value = bytes(self.data[self._offsets[index] : self._offsets[index + 1]])
+        if self.tag_type is str:
+            return ALLOWED_TYPES[str]().parse(value, None)
+        return value
+
+
+def decode_columns(
+    records: Iterable[bytes], tag_map: Any[Dict, TagMapHandle], codec: TLV = None
+) -> Dict[Any[int, str], Column]:
+    """Decode the tags listed in tag_map from a stream of encoded records.
+
+    Each record is a complete encoded TLV message. Only the top-level headers
+    are walked, no TLV object is created per record.
+
+    :args:
+        records: iterable of encoded messages (bytes, bytearray or memoryview).
+        tag_map: tags to extract, in the same format as TLV tag maps, or a
+                TagMapHandle from uttlv.registry.
+        codec: TLV instance holding the tag_size, len_size and endian
+                settings, a default TLV() if not given.
+
+    :returns:
+        dict mapping each tag name (or tag value, if unnamed) to a column.
+    """
+    if codec is None:
+        codec = TLV()
+    tag_map = resolve_tag_map(tag_map)
+    columns = {}
+    for tag, config in tag_map.items():
+        tag_type = config.get(TLV.Config.Type, bytes)
+        if isinstance(tag_type, type) and tag_type in INT_TYPECODES:
+            columns[tag] = FixedColumn(tag, tag_type)
+        else:
+            columns[tag] = VarColumn(tag, tag_type)
+
+    for index, record in enumerate(records):
+        data = memoryview(record)
+        found = {}
+        for tag, offset, length in codec.iter_fields(data):
+            if tag in columns:
+                found[tag] = data[offset : offset + length]
+        for tag, column in columns.items():
+            value = found.get(tag)
+            if value is not None and isinstance(column, FixedColumn):
+                if len(value) > column.width:
+                    raise ValueError(
+                        f"Value of tag {tag} in record {index} is {len(value)} bytes long, "
+                        f"more than the {column.width} bytes of its column"
+                    )
+                value = int.from_bytes(value, byteorder=codec.endian)
+            column.append(value)
+
+    return {tag_map[tag].get(TLV.Config.Name, tag): column for tag, column in columns.items()}
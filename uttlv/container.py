@@ -0,0 +1,268 @@
+from __future__ import annotations
+
+import bisect
+import lzma
+import os
+import struct
+import zlib
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List
+
+from .framing import frame, iter_frames
+from .registry import TagMapHandle, resolve_tag_map
+from .tlv import TLV
+
+# Block compressed container layout:
+#   MAGIC, compression id (1 byte)
+#   block 0 .. block N-1: compressed framed records (see uttlv.framing)
+#   index: one INDEX_ENTRY (offset, compressed size, raw size, records) per block
+#   trailer: index offset, block count, TRAILER_MAGIC
+
+MAGIC = b"UTLVBLK1"
+TRAILER_MAGIC = b"UTLVIDX1"
+INDEX_ENTRY = struct.Struct(">QQQQ")
+TRAILER = struct.Struct(">QQ8s")
+
+COMPRESSIONS = {
+    "none": (0, lambda data, level: data, lambda data: data),
+    "zlib": (
+        1,
+        lambda data, level: zlib.compress(data, -1 if level is None else level),
+        zlib.decompress,
+    ),
+    "lzma": (
+        2,
+        lambda data, level: lzma.compress(data, preset=level),
+        lzma.decompress,
+    ),
+}
+_COMPRESSION_NAMES = {code: name for name, (code, _, _) in COMPRESSIONS.items()}
+
+BlockInfo = namedtuple("BlockInfo", "offset compressed_size raw_size records")
+
+
+def _open(file: Any, mode: str):
+    """Return (file object, owned) for a path or an already open file."""
+    if isinstance(file, (str, os.PathLike)):
+        return open(file, mode), True
+    return file, False
+
+
+class BlockWriter:
+    """Write TLV records into independently compressed blocks.
+
+    Records are batched until a block holds at least block_size raw bytes,
+    then the block is compressed and written. The block index is written
+    by close().
+    """
+
+    def __init__(
+        self, file: Any, compression: str = "zlib", block_size: int = 1 << 20, level: int = None
+    ):
+        """
+        :args:
+            file: path or binary file object open for writing, at its start.
+            compression: "zlib", "lzma" or "none".
+            block_size: raw bytes per block before it is compressed.
+            level: compression level, the compressor default if None.
+        """
+        if compression not in COMPRESSIONS:
+            raise ValueError(f"Invalid compression {compression}")
+        self._file, self._owned = _open(file, "wb")
+        self.compression = compression
+        self.block_size = block_size
+        self.level = level
+        self.blocks: List[BlockInfo] = []
+        self._code, self._compress, _ = COMPRESSIONS[compression]
+        self._pending = []
+        self._pending_size = 0
+        self._file.write(MAGIC + bytes((self._code,)))
+        self._offset = len(MAGIC) + 1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def write(self, record: Any[TLV, bytes]) -> None:
+        """Add a record, given as a TLV object or an encoded array."""
+        framed = frame(record)
+        self._pending.append(framed)
+        self._pending_size += len(framed)
+        if self._pending_size >= self.block_size:
+            self.flush_block()
+
+    def write_many(self, records: Iterable[Any[TLV, bytes]]) -> None:
+        for record in records:
+            self.write(record)
+
+    def flush_block(self) -> None:
+        """Compress and write the pending records as one block."""
+        if not self._pending:
+            return
+        raw = b"".join(self._pending)
+        data = self._compress(raw, self.level)
+        self._file.write(data)
+        self.blocks.append(BlockInfo(self._offset, len(data), len(raw), len(self._pending)))
+        self._offset += len(data)
+        self._pending = []
+        self._pending_size = 0
+
+    def close(self) -> None:
+        """Write the last block and the block index."""
+        if self._file is None:
+            return
+        self.flush_block()
+        index = b"".join(INDEX_ENTRY.pack(*block) for block in self.blocks)
+        self._file.write(index + TRAILER.pack(self._offset, len(self.blocks), TRAILER_MAGIC))
+        if self._owned:
+            self._file.close()
+        else:
+            self._file.flush()
+        self._file = None
+
+
+def _read_block(file, block: BlockInfo, decompress) -> bytes:
+    file.seek(block.offset)
+    raw = decompress(file.read(block.compressed_size))
+    if len(raw) != block.raw_size:
+        raise ValueError(f"Corrupted block at offset {block.offset}")
+    return raw
+
+
+def _parse_records(raw: bytes, tag_map: Dict, settings: Dict) -> List[TLV]:
+    records = []
+    for record in iter_frames(raw):
+        tlv = TLV(**settings)
+        if tag_map is not None:
+            tlv.set_local_tag_map(tag_map)
+        tlv.parse_array(bytes(record))
+        records.append(tlv)
+    return records
+
+
+def _parse_block_worker(path, block, compression, tag_map, settings, parse):
+    with open(path, "rb") as f:
+        raw = _read_block(f, block, COMPRESSIONS[compression][2])
+    if not parse:
+        return [bytes(record) for record in iter_frames(raw)]
+    return _parse_records(raw, tag_map, settings)
+
+
+class BlockReader:
+    """Read a container written by BlockWriter.
+
+    Any block can be read on its own through the index, and blocks can be
+    decompressed and parsed in parallel by a process pool.
+    """
+
+    def __init__(self, file: Any):
+        """
+        :args:
+            file: path or seekable binary file object.
+        """
+        self.path = file if isinstance(file, (str, os.PathLike)) else None
+        self._file, self._owned = _open(file, "rb")
+        header = self._file.read(len(MAGIC) + 1)
+        if header[: len(MAGIC)] != MAGIC:
+            raise ValueError("Not a TLV block container")
+        self.compression = _COMPRESSION_NAMES[header[len(MAGIC)]]
+        self._decompress = COMPRESSIONS[self.compression][2]
+        self._file.seek(-TRAILER.size, os.SEEK_END)
+        index_offset, count, magic = TRAILER.unpack(self._file.read(TRAILER.size))
+        if magic != TRAILER_MAGIC:
+            raise ValueError("Missing block index, was the writer closed?")
+        self._file.seek(index_offset)
+        index = self._file.read(count * INDEX_ENTRY.size)
+        self.blocks = [BlockInfo(*entry) for entry in INDEX_ENTRY.iter_unpack(index)]
+        # Index of the first record of each block
+        self._first_records = []
+        total = 0
+        for block in self.blocks:
+            self._first_records.append(total)
+            total += block.records
+        self.record_count = total
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return len(self.blocks)
+
+    def __iter__(self) -> Iterator[bytes]:
+        """Iterate over all encoded records."""
+        for index in range(len(self.blocks)):
+            yield from self.read_block(index)
+
+    def close(self) -> None:
+        if self._owned:
+            self._file.close()
+
+    def read_block(self, index: int) -> List[bytes]:
+        """Return the encoded records of a block."""
+        raw = _read_block(self._file, self.blocks[index], self._decompress)
+        return [bytes(record) for record in iter_frames(raw)]
+
+    def parse_block(
+        self, index: int, tag_map: Any[Dict, TagMapHandle] = None, **kwargs
+    ) -> List[TLV]:
+        """Return the records of a block as TLV objects.
+
+        :args:
+            index: block index.
+            tag_map: local tag map of the records, or a TagMapHandle from
+                uttlv.registry, the global one if None.
+            kwargs: same settings as TLV().
+        """
+        raw = _read_block(self._file, self.blocks[index], self._decompress)
+        return _parse_records(raw, resolve_tag_map(tag_map), kwargs)
+
+    def block_of(self, record: int) -> int:
+        """Return the index of the block holding the given record number."""
+        if not 0 <= record < self.record_count:
+            raise IndexError("Record out of range")
+        return bisect.bisect_right(self._first_records, record) - 1
+
+    def record(self, record: int) -> bytes:
+        """Return a single encoded record, reading only its block."""
+        index = self.block_of(record)
+        return self.read_block(index)[record - self._first_records[index]]
+
+    def parallel_blocks(
+        self,
+        processes: int = None,
+        tag_map: Any[Dict, TagMapHandle] = None,
+        parse: bool = True,
+        **kwargs,
+    ) -> Iterator[List[Any[TLV, bytes]]]:
+        """Decompress (and parse) all blocks in a process pool.
+
+        Blocks are yielded in file order, each as a list of records.
+
+        :args:
+            processes: number of worker processes, os.cpu_count() if None.
+            tag_map: local tag map of the records, or a TagMapHandle from
+                uttlv.registry, whose current version is used for all
+                blocks. It must be picklable.
+            parse: return TLV objects, or encoded arrays if False.
+            kwargs: same settings as TLV().
+        """
+        if self.path is None:
+            raise ValueError("Parallel reading needs a container opened by path")
+        count = len(self.blocks)
+        tag_map = resolve_tag_map(tag_map)
+        with ProcessPoolExecutor(processes) as executor:
+            yield from executor.map(
+                _parse_block_worker,
+                [self.path] * count,
+                self.blocks,
+                [self.compression] * count,
+                [tag_map] * count,
+                [kwargs] * count,
+                [parse] * count,
+            )
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Any, Dict, List, Tuple
+
+from .registry import TagMapHandle, resolve_tag_map
+from .tlv import TLV, FrozenTLV
+
+
+class Diff:
+    """Differences between two TLV messages.
+
+    Each difference is a path, a tuple of tags from the top level down to
+    the tag that was added, removed or changed.
+    """
+
+    def __init__(self):
+        self.added: List[Tuple[int, ...]] = []
+        self.removed: List[Tuple[int, ...]] = []
+        self.changed: List[Tuple[int, ...]] = []
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.changed)
+
+    def __repr__(self):
+        return f"Diff(added={self.added}, removed={self.removed}, changed={self.changed})"
+
+
+def _fields(codec: TLV, data: bytes, start: int, end: int) -> Dict[int, Tuple[int, int]]:
+    # Repeated tags keep the last value, as parse_array() does
+    return {tag: (offset, length) for tag, offset, length in codec.iter_fields(data, start, end)}
+
+
+def _child_tag_map(tag_map: Dict, tag: int) -> Any[Dict, None]:
+    """Tag map to compare a nested value with, None if the value is not nested."""
+    tg_type = tag_map.get(tag, {}).get(TLV.Config.Type)
+    if isinstance(tg_type, Mapping):
+        return tg_type
+    if tg_type is TLV:
+        return TLV.global_tag_map()
+    return None
+
+
+def _diff_buffers(codec, old, old_start, old_end, new, new_start, new_end, tag_map, path, result):
+    old_fields = _fields(codec, old, old_start, old_end)
+    new_fields = _fields(codec, new, new_start, new_end)
+    new_view = memoryview(new)
+    for tag in old_fields:
+        if tag not in new_fields:
+            result.removed.append(path + (tag,))
+    for tag, (new_offset, new_length) in new_fields.items():
+        try:
+            old_offset, old_length = old_fields[tag]
+        except KeyError:
+            result.added.append(path + (tag,))
+            continue
+        # Equal encoded values need no further look
+        if old_length == new_length and old.startswith(
+            new_view[new_offset : new_offset + new_length], old_offset
+        ):
+            continue
+        child_map = _child_tag_map(tag_map, tag)
+        if child_map is None:
+            result.changed.append(path + (tag,))
+        else:
+            _diff_buffers(
+                codec,
+                old,
+                old_offset,
+                old_offset + old_length,
+                new,
+                new_offset,
+                new_offset + new_length,
+                child_map,
+                path + (tag,),
+                result,
+            )
+
+
+def _diff_objects(old: TLV, new: TLV, path: Tuple[int, ...], result: Diff) -> None:
+    old_items = old._items
+    new_items = new._items
+    for tag in old_items:
+        if tag not in new_items:
+            result.removed.append(path + (tag,))
+    for tag, new_value in new_items.items():
+        try:
+            old_value = old_items[tag]
+        except KeyError:
+            result.added.append(path + (tag,))
+            continue
+        if old_value is new_value:
+            continue
+        if isinstance(old_value, TLV) and isinstance(new_value, TLV):
+            if isinstance(old_value, FrozenTLV) and isinstance(new_value, FrozenTLV):
+                # Encoded arrays are already known
+                if old_value.to_byte_array() == new_value.to_byte_array():
+                    continue
+            _diff_objects(old_value, new_value, path + (tag,), result)
+        elif type(old_value) is not type(new_value) or old_value != new_value:
+            result.changed.append(path + (tag,))
+
+
+def diff(
+    old: Any[TLV, bytes],
+    new: Any[TLV, bytes],
+    tag_map: Any[Dict, TagMapHandle] = None,
+    codec: TLV = None,
+) -> Diff:
+    """Compare two messages tag by tag.
+
+    Two TLV objects are compared value by value. Encoded messages are
+    compared field by field without decoding: equal encoded values are
+    skipped with a single comparison and nested values (tags typed as TLV
+    or with a nested tag map) are compared recursively.
+
+    :args:
+        old, new: TLV objects or encoded messages.
+        tag_map: tag map of encoded messages, or a TagMapHandle from
+            uttlv.registry, codec.tag_map if not given.
+        codec: TLV object holding the settings of encoded messages. If not
+            given, the settings of old or new are used when one of them
+            is a TLV object, a default TLV() otherwise.
+    """
+    result = Diff()
+    if isinstance(old, TLV) and isinstance(new, TLV):
+        _diff_objects(old, new, (), result)
+        return result
+
+    if codec is None:
+        codec = old if isinstance(old, TLV) else new if isinstance(new, TLV) else TLV()
+    tag_map = codec.tag_map if tag_map is None else resolve_tag_map(tag_map)
+    old = old.to_byte_array() if isinstance(old, TLV) else old
+    new = new.to_byte_array() if isinstance(new, TLV) else new
+    if isinstance(old, memoryview):
+        old = bytes(old)
+    _diff_buffers(codec, old, 0, len(old), new, 0, len(new), tag_map, (), result)
+    return result
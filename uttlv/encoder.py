@@ -4,12 +4,31 @@ from binascii import hexlify
 
 
 class DefaultEncoder(object):
+    """Base class of value encoders.
+
+    Encoders may also define, to work on buffers without copies:
+        decode_from(buffer, offset, length, codec): decode the value at
+            buffer[offset:offset + length], used by parse_array() instead
+            of parse().
+        encode_into(value, buffer, offset): write the value at offset and
+            return its size, which size_of() must give, used instead of
+            default().
+    """
+
     def default(self, obj, _cls):
         try:
             return obj.to_byte_array()
         except AttributeError:
             raise TypeError("Invalid type")
 
+    def size_of(self, obj, _cls):
+        """Size in bytes of default(obj, _cls), without encoding if possible."""
+        try:
+            return obj.encoded_size()
+        except AttributeError:
+            pass
+        return len(self.default(obj, _cls))
+
     def to_string(self, obj, offset=0, use_names=False):
         try:
             return obj.tree(offset + obj.indent, use_names)
@@ -32,6 +51,11 @@ class Int8Encoder(DefaultEncoder):
             return obj.to_bytes(1, byteorder=_cls.endian)
         return super().default(obj)
 
+    def size_of(self, obj, _cls):
+        if isinstance(obj, int):
+            return 1
+        return super().size_of(obj, _cls)
+
     def parse(self, obj, _cls):
         return int.from_bytes(obj, byteorder=_cls.endian)
 
@@ -42,6 +66,11 @@ class Int16Encoder(DefaultEncoder):
             return obj.to_bytes(2, byteorder=_cls.endian)
         return super().default(obj)
 
+    def size_of(self, obj, _cls):
+        if isinstance(obj, int):
+            return 2
+        return super().size_of(obj, _cls)
+
     def parse(self, obj, _cls):
         return int.from_bytes(obj, byteorder=_cls.endian)
 
@@ -52,6 +81,11 @@ class Int32Encoder(DefaultEncoder):
             return obj.to_bytes(4, byteorder=_cls.endian)
         return super().default(obj)
 
+    def size_of(self, obj, _cls):
+        if isinstance(obj, int):
+            return 4
+        return super().size_of(obj, _cls)
+
     def parse(self, obj, _cls):
         return int.from_bytes(obj, byteorder=_cls.endian)
 
@@ -62,6 +96,11 @@ class Int64Encoder(DefaultEncoder):
             return obj.to_bytes(8, byteorder=_cls.endian)
         return super().default(obj)
 
+    def size_of(self, obj, _cls):
+        if isinstance(obj, int):
+            return 8
+        return super().size_of(obj, _cls)
+
     def parse(self, obj, _cls):
         return int.from_bytes(obj, byteorder=_cls.endian)
 
@@ -72,6 +111,11 @@ class AsciiEncoder(DefaultEncoder):
             return obj.encode("ascii")
         return super().default(obj)
 
+    def size_of(self, obj, _cls):
+        if isinstance(obj, str) and obj.isascii():
+            return len(obj)
+        return super().size_of(obj, _cls)
+
     def parse(self, obj, _cls):
         return obj.decode("ascii")
 
@@ -82,6 +126,11 @@ class BytesEncoder(DefaultEncoder):
             return obj
         return super().default(obj)
 
+    def size_of(self, obj, _cls):
+        if isinstance(obj, bytes):
+            return len(obj)
+        return super().size_of(obj, _cls)
+
     def to_string(self, obj, offset=0, use_names=False):
         return str(hexlify(obj), "ascii")
 
@@ -89,12 +138,34 @@ class BytesEncoder(DefaultEncoder):
         return obj
 
 
+class FileSliceEncoder(DefaultEncoder):
+    def default(self, obj, _cls):
+        try:
+            return obj.read()
+        except AttributeError:
+            return super().default(obj, _cls)
+
+    def size_of(self, obj, _cls):
+        return len(obj)
+
+    def to_string(self, obj, offset=0, use_names=False):
+        return repr(obj)
+
+    def parse(self, obj, _cls):
+        return obj
+
+
 class Utf8Encoder(DefaultEncoder):
     def default(self, obj, _cls):
         if isinstance(obj, str):
             return obj.encode("utf8")
         return super().default(obj)
 
+    def size_of(self, obj, _cls):
+        if isinstance(obj, str) and obj.isascii():
+            return len(obj)
+        return super().size_of(obj, _cls)
+
     def parse(self, obj, _cls):
         return obj.decode("utf8")
 
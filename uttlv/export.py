@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import os
+import time
+from collections import deque
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List
+
+from .framing import frame
+from .registry import TagMapHandle, resolve_tag_map
+from .tlv import TLV
+
+
+def _tag_of(tag_map: Mapping, key: Any[int, str]) -> int:
+    if isinstance(key, int):
+        return key
+    for tag, config in tag_map.items():
+        if config.get(TLV.Config.Name) == key:
+            return tag
+    raise KeyError(f"Key {key} not found")
+
+
+def build_tlv(row: Mapping, tag_map: Any[Mapping, TagMapHandle], **kwargs) -> TLV:
+    """Build a TLV object from a plain dict.
+
+    :args:
+        row: dict of values keyed by tag or tag name. Values of tags typed
+            with a fixed width int type (Int8, Int16, Int64) are converted
+            to it, values of nested tags may be dicts themselves.
+        tag_map: tag map giving names and types, or a TagMapHandle from
+            uttlv.registry.
+        kwargs: same settings as TLV().
+    """
+    tag_map = resolve_tag_map(tag_map)
+    tlv = TLV(**kwargs)
+    kwargs.pop("checksum", None)
+    for key, value in row.items():
+        tag = _tag_of(tag_map, key)
+        tg_type = tag_map.get(tag, {}).get(TLV.Config.Type)
+        if isinstance(value, Mapping):
+            child_map = tg_type if isinstance(tg_type, Mapping) else TLV.global_tag_map()
+            value = build_tlv(value, child_map, **kwargs)
+        elif tg_type is not None and isinstance(tg_type, type) and issubclass(tg_type, int):
+            value = tg_type(value)
+        tlv[tag] = value
+    return tlv
+
+
+def _encode_rows(rows: List[Mapping], tag_map: Mapping, settings: Dict, framed: bool) -> bytes:
+    records = (build_tlv(row, tag_map, **settings).to_byte_array() for row in rows)
+    if framed:
+        records = (frame(record) for record in records)
+    return b"".join(records)
+
+
+def _chunks(rows: Iterable[Mapping], chunk_size: int) -> Iterator[List[Mapping]]:
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class ExportStats:
+    """Counters of an export, see export()."""
+
+    def __init__(self, records: int, size: int, seconds: float):
+        self.records = records
+        self.size = size
+        self.seconds = seconds
+
+    def __repr__(self):
+        return (
+            f"ExportStats(records={self.records}, size={self.size}, "
+            f"seconds={self.seconds:.3f})"
+        )
+
+    @property
+    def records_per_second(self) -> float:
+        return self.records / self.seconds if self.seconds else 0.0
+
+    @property
+    def bytes_per_second(self) -> float:
+        return self.size / self.seconds if self.seconds else 0.0
+
+
+def _writer(target: Any):
+    if isinstance(target, bytearray):
+        return target.extend
+    return target.write
+
+
+def export(
+    rows: Iterable[Mapping],
+    tag_map: Any[Mapping, TagMapHandle],
+    target: Any,
+    processes: int = None,
+    chunk_size: int = 1000,
+    framed: bool = False,
+    **kwargs,
+) -> ExportStats:
+    """Encode plain dicts into TLV records in a process pool.
+
+    Rows are sent to the workers in chunks, as plain dicts, and each
+    worker returns the encoded records of its chunk in one array. Chunks
+    are written in input order, and only a few of them are in flight at a
+    time, so rows can come from a generator of any length.
+
+    :args:
+        rows: dicts of values, see build_tlv().
+        tag_map: tag map of the records, or a TagMapHandle from
+            uttlv.registry, whose current version is used for the whole
+            export. It must be picklable.
+        target: path, binary file object or bytearray to write to.
+        processes: number of worker processes, os.cpu_count() if None, 0 to
+            encode in this process.
+        chunk_size: rows per chunk sent to a worker.
+        framed: prefix each record with its length, see uttlv.framing.
+        kwargs: same settings as TLV().
+
+    :returns:
+        ExportStats with the number of records, bytes and seconds taken.
+    """
+    if isinstance(target, (str, os.PathLike)):
+        with open(target, "wb") as f:
+            return export(rows, tag_map, f, processes, chunk_size, framed, **kwargs)
+    # One version of a registered map for all chunks
+    tag_map = resolve_tag_map(tag_map)
+    write = _writer(target)
+    records = 0
+    size = 0
+    start = time.perf_counter()
+    chunks = _chunks(rows, chunk_size)
+    if processes == 0:
+        for chunk in chunks:
+            data = _encode_rows(chunk, tag_map, kwargs, framed)
+            write(data)
+            records += len(chunk)
+            size += len(data)
+        return ExportStats(records, size, time.perf_counter() - start)
+
+    # Chunks submitted ahead of the one being written
+    max_pending = 2 * (processes or os.cpu_count() or 1)
+    pending = deque()
+    with ProcessPoolExecutor(processes) as executor:
+        for chunk in chunks:
+            future = executor.submit(_encode_rows, chunk, tag_map, kwargs, framed)
+            pending.append((len(chunk), future))
+            if len(pending) < max_pending:
+                continue
+            count, future = pending.popleft()
+            data = future.result()
+            write(data)
+            records += count
+            size += len(data)
+        for count, future in pending:
+            data = future.result()
+            write(data)
+            records += count
+            size += len(data)
+    return ExportStats(records, size, time.perf_counter() - start)
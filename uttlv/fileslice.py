@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import os
+import socket
+from contextlib import contextmanager
+from typing import Any
+
+# Chunk size used when a region has to be copied through memory
+CHUNK_SIZE = 1 << 20
+
+
+def _pread(fd: int, length: int, offset: int) -> bytes:
+    """Read up to length bytes at offset, stopping early only at end of file."""
+    chunks = []
+    while length > 0:
+        if hasattr(os, "pread"):
+            chunk = os.pread(fd, length, offset)
+        else:  # pragma: no cover - Windows
+            os.lseek(fd, offset, os.SEEK_SET)
+            chunk = os.read(fd, length)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        length -= len(chunk)
+        offset += len(chunk)
+    return b"".join(chunks)
+
+
+@contextmanager
+def _opened(file: Any[str, os.PathLike, int]):
+    """Yield a read-only descriptor for a path, or the given descriptor."""
+    if isinstance(file, int):
+        yield file
+        return
+    fd = os.open(file, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    try:
+        yield fd
+    finally:
+        os.close(fd)
+
+
+def _output_fd(target: Any) -> int:
+    if isinstance(target, int):
+        return target
+    # Data buffered by a file object must reach the descriptor first
+    flush = getattr(target, "flush", None)
+    if flush is not None:
+        flush()
+    return target.fileno()
+
+
+class FileSlice:
+    """Value stored in a region of a file instead of in memory.
+
+    The region is only read when the value is encoded in memory. Writers
+    that support it (see uttlv.writer) copy it straight from the file.
+    """
+
+    def __init__(self, file: Any[str, os.PathLike, int], offset: int = 0, length: int = None):
+        """
+        :args:
+            file: path or file descriptor of the file.
+            offset: start of the region.
+            length: size of the region, up to the end of file if None.
+        """
+        self.file = file
+        self.offset = offset
+        if length is None:
+            with _opened(file) as fd:
+                length = max(os.fstat(fd).st_size - offset, 0)
+        self.length = length
+
+    def __len__(self):
+        return self.length
+
+    def __repr__(self):
+        return f"FileSlice({self.file!r}, {self.offset}, {self.length})"
+
+    def read(self) -> bytes:
+        """Read the whole region into memory."""
+        with _opened(self.file) as fd:
+            data = _pread(fd, self.length, self.offset)
+        if len(data) != self.length:
+            raise ValueError(f"{self!r} goes past the end of file")
+        return data
+
+    def chunks(self, chunk_size: int = CHUNK_SIZE):
+        """Iterate over the region in chunks of at most chunk_size bytes."""
+        with _opened(self.file) as fd:
+            pos = self.offset
+            end = self.offset + self.length
+            while pos < end:
+                chunk = _pread(fd, min(chunk_size, end - pos), pos)
+                if not chunk:
+                    raise ValueError(f"{self!r} goes past the end of file")
+                yield chunk
+                pos += len(chunk)
+
+    def copy_to(self, target: Any) -> int:
+        """Copy the region to a socket, file descriptor or file object.
+
+        os.sendfile() is used when available, a chunked copy otherwise.
+
+        :returns:
+            number of bytes written.
+        """
+        if not self.length:
+            return 0
+        with _opened(self.file) as fd:
+            if isinstance(target, socket.socket):
+                with open(fd, "rb", closefd=False) as f:
+                    return target.sendfile(f, self.offset, self.length)
+            out = _output_fd(target)
+            sent = 0
+            if hasattr(os, "sendfile"):
+                try:
+                    while sent < self.length:
+                        count = os.sendfile(out, fd, self.offset + sent, self.length - sent)
+                        if not count:
+                            raise ValueError(f"{self!r} goes past the end of file")
+                        sent += count
+                    return sent
+                except OSError:
+                    # Not supported for this kind of descriptor
+                    if sent:
+                        raise
+        for chunk in self.chunks():
+            view = memoryview(chunk)
+            while view:
+                view = view[os.write(out, view) :]
+            sent += len(chunk)
+        return sent
+
+
+class FileReader:
+    """Positional reader over a file, buffering small reads.
+
+    It can be sliced like a bytes object, reader[start:stop] reading that
+    region of the file.
+    """
+
+    def __init__(self, file: Any[str, os.PathLike, int], chunk_size: int = 1 << 16):
+        if isinstance(file, int):
+            self.fd = file
+            self._owned = False
+        else:
+            self.fd = os.open(file, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+            self._owned = True
+        self.size = os.fstat(self.fd).st_size
+        self.chunk_size = chunk_size
+        self._window = b""
+        self._window_pos = 0
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, key: Any[int, slice]) -> Any[int, bytes]:
+        if isinstance(key, slice):
+            start, stop, _ = key.indices(self.size)
+            return self.read(start, max(stop - start, 0))
+        if not 0 <= key < self.size:
+            raise IndexError("FileReader index out of range")
+        return self.read(key, 1)[0]
+
+    def read(self, pos: int, length: int) -> bytes:
+        """Read up to length bytes at pos."""
+        offset = pos - self._window_pos
+        if 0 <= offset and offset + length <= len(self._window):
+            return self._window[offset : offset + length]
+        if length >= self.chunk_size:
+            return _pread(self.fd, length, pos)
+        self._window = _pread(self.fd, self.chunk_size, pos)
+        self._window_pos = pos
+        return self._window[:length]
+
+    def close(self):
+        if self._owned:
+            os.close(self.fd)
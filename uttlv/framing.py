@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from typing import Any, Iterable, Iterator
+
+from .tlv import TLV
+
+# Size of the length prefix of each framed record
+FRAME_HEADER_SIZE = 4
+
+
+def frame(record: Any[TLV, bytes]) -> bytes:
+    """Prefix an encoded record with its length, as a 4 bytes big endian int."""
+    if isinstance(record, TLV):
+        record = record.to_byte_array()
+    return len(record).to_bytes(FRAME_HEADER_SIZE, byteorder="big") + record
+
+
+def frame_records(records: Iterable[Any[TLV, bytes]]) -> bytes:
+    """Frame and join a sequence of records."""
+    return b"".join(frame(record) for record in records)
+
+
+def iter_frames(data: Any[bytes, memoryview]) -> Iterator[memoryview]:
+    """Iterate over the records of framed data, without copying them."""
+    data = memoryview(data)
+    pos = 0
+    end = len(data)
+    while pos < end:
+        if end - pos < FRAME_HEADER_SIZE:
+            raise ValueError(f"Truncated frame header at offset {pos}")
+        length = int.from_bytes(data[pos : pos + FRAME_HEADER_SIZE], byteorder="big")
+        pos += FRAME_HEADER_SIZE
+        if end - pos < length:
+            raise ValueError(f"Truncated record at offset {pos}")
+        yield data[pos : pos + length]
+        pos += length
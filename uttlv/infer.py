@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Tuple
+
+from .tlv import TLV, Int8, Int16, Int64
+
+# Integer type inferred for values of a constant length
+INT_TYPES = {1: Int8, 2: Int16, 4: int, 8: Int64}
+
+
+def _is_text(value: bytes) -> bool:
+    try:
+        text = value.decode("utf-8")
+    except UnicodeDecodeError:
+        return False
+    return text.isprintable()
+
+
+def _tag_map(stats: Dict[int, TagStats]) -> Dict:
+    return {tag: {TLV.Config.Type: tag_stats.infer_type()} for tag, tag_stats in stats.items()}
+
+
+class TagStats:
+    """Statistics of the values of one tag, at one nesting level."""
+
+    def __init__(self, tag: int):
+        self.tag = tag
+        # Occurrences, and messages (or parent values) holding the tag
+        self.count = 0
+        self.messages = 0
+        self.min_length = None
+        self.max_length = 0
+        self.total_length = 0
+        # Still true while every value was printable UTF-8 text
+        self.text = True
+        # Values that are well formed TLV arrays, and their tags
+        self.nested = 0
+        self.children: Dict[int, TagStats] = {}
+
+    def __repr__(self):
+        return (
+            f"TagStats({self.tag:#x}, count={self.count}, "
+            f"length={self.min_length}..{self.max_length})"
+        )
+
+    @property
+    def mean_length(self) -> float:
+        return self.total_length / self.count if self.count else 0.0
+
+    @property
+    def fixed_length(self) -> bool:
+        return self.min_length == self.max_length
+
+    def add(self, value: bytes) -> None:
+        length = len(value)
+        self.count += 1
+        self.total_length += length
+        self.max_length = max(self.max_length, length)
+        self.min_length = length if self.min_length is None else min(self.min_length, length)
+        if self.text and length:
+            self.text = _is_text(value)
+
+    def infer_type(self) -> Any[type, Dict]:
+        """Return the most likely type of the values, see TagMapInference."""
+        if self.fixed_length and self.min_length in INT_TYPES:
+            if not (self.text and self.min_length > 1):
+                return INT_TYPES[self.min_length]
+        if self.nested == self.count and self.max_length:
+            return _tag_map(self.children)
+        if self.text and self.max_length:
+            return str
+        return bytes
+
+
+class TagMapInference:
+    """Infer a tag map from sample messages.
+
+    Each value is classified while the samples are scanned, without
+    keeping them. The type of a tag is the first that applies of:
+        - integer, for values of a constant length of 1, 2, 4 or 8 bytes
+          that are not all printable UTF-8 (1 byte values are integers
+          even when printable);
+        - nested tag map, when all values are well formed TLV arrays
+          (every header fits and the fields end with the value), which
+          are scanned recursively;
+        - string, when all values are printable UTF-8;
+        - bytes.
+    Constant length values that are well formed TLV arrays are reported as
+    integers, and printable integers as strings, review them before use.
+    """
+
+    def __init__(self, codec: TLV = None, max_depth: int = 8):
+        """
+        :args:
+            codec: TLV object holding the settings, a default TLV() if None.
+            max_depth: deepest nesting level scanned.
+        """
+        self.codec = TLV() if codec is None else codec
+        self.max_depth = max_depth
+        self.messages = 0
+        self.stats: Dict[int, TagStats] = {}
+
+    def _fields(self, data: bytes) -> Any[List[Tuple[int, int, int]], None]:
+        """Return the fields of a well formed array, None otherwise."""
+        min_size = self.codec.min_header_size
+        end = len(data)
+        pos = 0
+        fields = []
+        try:
+            while pos < end:
+                if end - pos < min_size:
+                    return None
+                tag, length, header_size = self.codec.decode_header(data, pos, end)
+                pos += header_size
+                if pos + length > end:
+                    return None
+                fields.append((tag, pos, length))
+                pos += length
+        except (ValueError, IndexError):
+            return None
+        return fields or None
+
+    def _add_fields(self, stats: Dict, fields: Iterable, data: bytes, depth: int) -> None:
+        seen = set()
+        for tag, offset, length in fields:
+            tag_stats = stats.get(tag)
+            if tag_stats is None:
+                tag_stats = stats[tag] = TagStats(tag)
+            value = data[offset : offset + length]
+            tag_stats.add(value)
+            if tag not in seen:
+                tag_stats.messages += 1
+                seen.add(tag)
+            if depth < self.max_depth:
+                children = self._fields(value)
+                if children is not None:
+                    tag_stats.nested += 1
+                    self._add_fields(tag_stats.children, children, value, depth + 1)
+
+    def add(self, message: Any[TLV, bytes]) -> None:
+        """Scan one encoded message."""
+        if isinstance(message, TLV):
+            message = message.to_byte_array()
+        self.messages += 1
+        self._add_fields(self.stats, self.codec.iter_fields(message), bytes(message), 0)
+
+    def add_many(self, messages: Iterable[Any[TLV, bytes]]) -> None:
+        for message in messages:
+            self.add(message)
+
+    def tag_map(self) -> Dict:
+        """Return the inferred tag map, usable with TLV.set_global_tag_map()."""
+        return _tag_map(self.stats)
+
+    def report(self) -> str:
+        """Return a table of the inferred type and statistics of each tag."""
+        lines = ["tag                 type    freq  count    min    max     mean"]
+        self._report(lines, self.stats, self.messages, 0)
+        return "\n".join(lines)
+
+    def _report(self, lines: List[str], stats: Dict, parents: int, depth: int) -> None:
+        for tag, tag_stats in sorted(stats.items()):
+            tg_type = tag_stats.infer_type()
+            type_name = "nested" if isinstance(tg_type, dict) else tg_type.__name__
+            encoded_tag = self.codec.header_table().tag(tag).hex()
+            freq = tag_stats.messages / parents if parents else 0.0
+            lines.append(
+                f"{' ' * 2 * depth + encoded_tag:<18}  {type_name:<6} {freq:5.0%} "
+                f"{tag_stats.count:6d} {tag_stats.min_length:6d} {tag_stats.max_length:6d} "
+                f"{tag_stats.mean_length:8.1f}"
+            )
+            if isinstance(tg_type, dict):
+                self._report(lines, tag_stats.children, tag_stats.nested, depth + 1)
+
+
+def infer_tag_map(messages: Iterable[Any[TLV, bytes]], codec: TLV = None) -> Dict:
+    """Infer a tag map from sample messages, see TagMapInference."""
+    inference = TagMapInference(codec)
+    inference.add_many(messages)
+    return inference.tag_map()
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from typing import Any, Dict
+
+from .tlv import TLV
+
+
+class TLVPool:
+    """Pool of reusable TLV objects for high rate parsing.
+
+    Objects taken from the pool parse nested values into pooled children,
+    which go back to the pool when their parent is cleared or released.
+    Values read from a released object must not be used anymore.
+    """
+
+    def __init__(self, maxsize: int = 1024, **kwargs):
+        """
+        :args:
+            maxsize: maximum number of free objects kept.
+            kwargs: settings of the pooled objects, same as TLV().
+        """
+        self.maxsize = maxsize
+        self.settings = kwargs
+        self._free = []
+
+    def __len__(self):
+        return len(self._free)
+
+    def acquire(self) -> TLV:
+        """Take an empty object from the pool, creating one if needed."""
+        try:
+            tlv = self._free.pop()
+        except IndexError:
+            tlv = TLV(**self.settings)
+            tlv._pool = self
+            return tlv
+        # Objects released as nested children had their checksum dropped
+        tlv.checksum = self.settings.get("checksum")
+        return tlv
+
+    def release(self, tlv: TLV) -> None:
+        """Reset an object and give it back to the pool."""
+        if tlv._pool is not self:
+            raise ValueError("Object does not belong to this pool")
+        tlv.reset()
+        if len(self._free) < self.maxsize:
+            self._free.append(tlv)
+
+    def parse(self, data: Any[list, bytes], tag_map: Dict = None, target: TLV = None) -> TLV:
+        """Parse a byte array into a pooled object.
+
+        :args:
+            data: array to parse.
+            tag_map: local tag map to set before parsing.
+            target: pooled object to fill, after clearing it. A new one is
+                acquired if not given.
+        """
+        if target is None:
+            target = self.acquire()
+        else:
+            target.clear()
+        if tag_map is not None:
+            target.set_local_tag_map(tag_map)
+        target.parse_array(data)
+        return target
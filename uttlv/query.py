@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Any, Dict, List, Sequence
+
+from .registry import TagMapHandle, resolve_tag_map
+from .tlv import TLV
+
+# Path element matching any tag
+WILDCARD = "*"
+
+
+class PathQuery:
+    """Path to values inside encoded TLV messages.
+
+    Only the headers along the path are read, the other values are skipped
+    without being decoded.
+    """
+
+    def __init__(
+        self,
+        path: Any[str, Sequence],
+        tag_map: Any[Dict, TagMapHandle] = None,
+        codec: TLV = None,
+    ):
+        """
+        :args:
+            path: "/" separated string or sequence of path elements. Each
+                element is a tag value, a tag name from the tag map of its
+                level or "*" to match any tag.
+            tag_map: tag map of the top level, codec.tag_map if not given.
+                A TagMapHandle from uttlv.registry is resolved on each
+                search.
+            codec: TLV instance holding the tag_size, len_size and endian
+                settings, a default TLV() if not given.
+        """
+        if isinstance(path, str):
+            path = [element for element in path.split("/") if element]
+        if not path:
+            raise ValueError("Empty path")
+        self.codec = TLV() if codec is None else codec
+        self.tag_map = self.codec.tag_map if tag_map is None else tag_map
+        self.path = tuple(path)
+        # Last (tag map, tag) each path element was resolved with. Holding
+        # the map keeps its identity valid, one entry per element bounds it
+        self._resolved = [None] * len(self.path)
+
+    def _resolve(self, tag_map: Dict, depth: int) -> Any[int, None]:
+        """Translate the path element at depth into a tag value, None for wildcards."""
+        element = self.path[depth]
+        if isinstance(element, int):
+            return element
+        resolved = self._resolved[depth]
+        if resolved is not None and resolved[0] is tag_map:
+            return resolved[1]
+        if element == WILDCARD:
+            tag = None
+        else:
+            for tag, config in tag_map.items():
+                if config.get(TLV.Config.Name) == element:
+                    break
+            else:
+                try:
+                    tag = int(element, 0)
+                except ValueError:
+                    raise KeyError(f"Key {element} not found") from None
+        self._resolved[depth] = (tag_map, tag)
+        return tag
+
+    @staticmethod
+    def _child_tag_map(tag_map: Dict, tag: int) -> Dict:
+        tg_type = tag_map.get(tag, {}).get(TLV.Config.Type)
+        if isinstance(tg_type, Mapping):
+            return tg_type
+        return TLV.global_tag_map()
+
+    def _walk(self, data: memoryview, start: int, end: int, depth: int, tag_map: Dict):
+        tag_sel = self._resolve(tag_map, depth)
+        last = depth == len(self.path) - 1
+        for tag, offset, length in self.codec.iter_fields(data, start, end):
+            if tag_sel is not None and tag != tag_sel:
+                continue
+            if last:
+                yield tag_map, tag, offset, length
+            else:
+                child_map = self._child_tag_map(tag_map, tag)
+                yield from self._walk(data, offset, offset + length, depth + 1, child_map)
+
+    def _matches(self, data: Any[bytes, memoryview], raw: bool):
+        data = memoryview(data)
+        top_map = resolve_tag_map(self.tag_map)
+        for tag_map, tag, offset, length in self._walk(data, 0, len(data), 0, top_map):
+            value = data[offset : offset + length]
+            if raw:
+                yield value
+            else:
+                yield self.codec._parse_value(tag_map, tag, bytes(value))
+
+    def find(self, data: Any[bytes, memoryview], default: Any = None, raw: bool = False) -> Any:
+        """Return the first value matching the path, default if none.
+
+        :args:
+            data: encoded message.
+            default: value returned when nothing matches.
+            raw: return the encoded value as a memoryview instead of
+                decoding it according to the tag map.
+        """
+        for value in self._matches(data, raw):
+            return value
+        return default
+
+    def find_all(self, data: Any[bytes, memoryview], raw: bool = False) -> List:
+        """Return all values matching the path, in message order."""
+        return list(self._matches(data, raw))
+
+
+def compile_path(
+    path: Any[str, Sequence], tag_map: Any[Dict, TagMapHandle] = None, codec: TLV = None
+) -> PathQuery:
+    """Compile a path query, see PathQuery."""
+    return PathQuery(path, tag_map, codec)
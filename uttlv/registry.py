@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import threading
+from collections.abc import Mapping
+from typing import Any, Dict, List, Tuple
+
+
+def _read_only(self, *args, **kwargs):
+    raise TypeError("Registered tag maps are read-only")
+
+
+class FrozenMap(dict):
+    """Read-only dict holding a registered tag map or tag config.
+
+    Unlike a MappingProxyType it can be pickled and copied, so objects
+    parsed with a registered map can be sent to other processes, and
+    lookups run at plain dict speed.
+    """
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __reduce__(self):
+        return (FrozenMap, (dict(self),))
+
+    def __repr__(self):
+        return f"FrozenMap({dict.__repr__(self)})"
+
+
+def _freeze(tag_map: Mapping) -> FrozenMap:
+    """Return a read-only copy of a tag map, nested tag maps included."""
+    return FrozenMap(
+        {
+            tag: FrozenMap(
+                {
+                    key: _freeze(value) if isinstance(value, Mapping) else value
+                    for key, value in config.items()
+                }
+            )
+            for tag, config in tag_map.items()
+        }
+    )
+
+
+def resolve_tag_map(tag_map: Any[Mapping, TagMapHandle, None]) -> Any[Mapping, None]:
+    """Return the current version of a TagMapHandle, other tag maps as they are."""
+    if isinstance(tag_map, TagMapHandle):
+        return tag_map.tag_map
+    return tag_map
+
+
+class TagMapHandle:
+    """Reference to the current version of a registered tag map.
+
+    TLV objects given a handle as tag map resolve it once per parse, with a
+    single attribute read and no lock, so a swap never shows a parse two
+    versions of the map.
+    """
+
+    def __init__(self, name: str, tag_map: FrozenMap):
+        self.name = name
+        # (version, tag map) pair, replaced as a whole by swaps
+        self._current = (1, tag_map)
+
+    def __repr__(self):
+        return f"TagMapHandle({self.name!r}, version={self.version})"
+
+    @property
+    def tag_map(self) -> FrozenMap:
+        """Current version of the tag map, read-only."""
+        return self._current[1]
+
+    @property
+    def version(self) -> int:
+        return self._current[0]
+
+    def snapshot(self) -> Tuple[int, FrozenMap]:
+        """Return the current (version, tag map) pair, read atomically."""
+        return self._current
+
+
+class TagMapRegistry:
+    """Named, immutable and versioned tag maps shared between threads.
+
+    Maps are validated and frozen once when registered. Registering a name
+    again swaps in a new version atomically: parses already running finish
+    with the version they started with, later ones see the new one.
+    """
+
+    def __init__(self):
+        self._handles: Dict[str, TagMapHandle] = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._handles
+
+    def __getitem__(self, name: str) -> TagMapHandle:
+        return self._handles[name]
+
+    def __len__(self):
+        return len(self._handles)
+
+    def names(self) -> List[str]:
+        return list(self._handles)
+
+    def register(self, name: str, tag_map: Mapping) -> TagMapHandle:
+        """Register a tag map, or swap in a new version of it.
+
+        :args:
+            name: name of the tag map.
+            tag_map: tag map, validated as by TLV.set_global_tag_map().
+        :returns:
+            the handle of the name, the same object for every version.
+        """
+        # Imported here, uttlv.tlv depends on this module
+        from .tlv import TLV
+
+        TLV.validate_tag_map(tag_map)
+        frozen = _freeze(tag_map)
+        with self._lock:
+            handle = self._handles.get(name)
+            if handle is None:
+                handle = self._handles[name] = TagMapHandle(name, frozen)
+            else:
+                handle._current = (handle.version + 1, frozen)
+        return handle
+
+    def swap(self, name: str, tag_map: Mapping) -> int:
+        """Replace a registered tag map, returning the new version.
+
+        Unlike register(), the name must already be registered.
+        """
+        if name not in self._handles:
+            raise KeyError(f"Tag map {name} not registered")
+        return self.register(name, tag_map).version
+
+
+# Registry used when none is given
+default_registry = TagMapRegistry()
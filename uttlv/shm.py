@@ -0,0 +1,344 @@
+from __future__ import annotations
+
+import os
+import queue
+import struct
+import time
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, Iterator, List
+
+from .framing import FRAME_HEADER_SIZE
+from .registry import TagMapHandle, resolve_tag_map
+from .tlv import TLV
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:  # pragma: no cover - Python 3.7
+    shared_memory = None
+
+# Ring layout in the shared memory block. Positions are byte counters that
+# only grow, each on its own cache line so producer and consumer do not
+# write to the same one:
+#   CAPACITY_OFFSET: size of the data region, written once
+#   WRITE_OFFSET: bytes published by the producer
+#   READ_OFFSET: bytes released by the consumer
+#   DATA_OFFSET: data region, entries of ENTRY header + batch, 8 bytes aligned
+CAPACITY_OFFSET = 0
+WRITE_OFFSET = 64
+READ_OFFSET = 128
+DATA_OFFSET = 192
+POSITION = struct.Struct("<Q")
+ENTRY = struct.Struct("<I")
+# Entry length telling the consumer to go back to the start of the region
+WRAP = 0xFFFFFFFF
+ALIGN = 8
+# Sleep between polls of a blocked put() or get()
+POLL_INTERVAL = 0.0001
+
+
+def _aligned(size: int) -> int:
+    return (size + ALIGN - 1) & ~(ALIGN - 1)
+
+
+class TLVView:
+    """Read-only TLV object decoded lazily from a buffer.
+
+    The headers are walked on first access and values are decoded one by
+    one when read, nested values as views of the same buffer.
+    """
+
+    def __init__(
+        self,
+        data: Any[bytes, memoryview],
+        codec: TLV = None,
+        tag_map: Any[Dict, TagMapHandle] = None,
+        start: int = 0,
+        end: int = None,
+    ):
+        """
+        :args:
+            data: buffer holding the encoded object.
+            codec: TLV object holding the settings, a default TLV() if None.
+            tag_map: tag map, or a TagMapHandle from uttlv.registry,
+                codec.tag_map if None.
+            start, end: region of data holding the object, all of it by
+                default.
+        """
+        self.codec = TLV() if codec is None else codec
+        self.tag_map = self.codec.tag_map if tag_map is None else resolve_tag_map(tag_map)
+        self._data = data
+        self._start = start
+        self._end = len(data) if end is None else end
+        self._fields = None
+        self._values = {}
+
+    def _index(self) -> Dict:
+        if self._data is None:
+            raise ValueError("View used after its batch was released")
+        if self._fields is None:
+            fields = {}
+            for tag, offset, length in self.codec.iter_fields(self._data, self._start, self._end):
+                fields[tag] = (offset, length)
+            self._fields = fields
+        return self._fields
+
+    def _tag(self, key: Any[int, str]) -> int:
+        if isinstance(key, str):
+            for tag, config in self.tag_map.items():
+                if config.get(TLV.Config.Name) == key:
+                    return tag
+            raise AttributeError(f"Key {key} not found")
+        return key
+
+    def __len__(self):
+        return len(self._index())
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._index())
+
+    def __contains__(self, key: Any[int, str]) -> bool:
+        return self._tag(key) in self._index()
+
+    def __getitem__(self, key: Any[int, str]) -> Any:
+        tag = self._tag(key)
+        try:
+            return self._values[tag]
+        except KeyError:
+            pass
+        offset, length = self._index()[tag]
+        tg_type = self.tag_map.get(tag, {}).get(TLV.Config.Type)
+        if isinstance(tg_type, Mapping) or tg_type is TLV:
+            child_map = tg_type if tg_type is not TLV else TLV.global_tag_map()
+            value = TLVView(self._data, self.codec, child_map, offset, offset + length)
+        elif tg_type is None and self.codec.tag_size is None and self.codec.is_constructed(tag):
+            value = TLVView(self._data, self.codec, {}, offset, offset + length)
+        else:
+            value = self.codec._decode_field(self.tag_map, tag, self._data, offset, length)
+        self._values[tag] = value
+        return value
+
+    def raw(self, key: Any[int, str]) -> memoryview:
+        """Return the encoded value of a tag without copying it.
+
+        The memoryview must be released before the batch of the view.
+        """
+        offset, length = self._index()[self._tag(key)]
+        return memoryview(self._data)[offset : offset + length]
+
+    def to_byte_array(self) -> bytes:
+        self._index()
+        return bytes(self._data[self._start : self._end])
+
+    def to_tlv(self) -> TLV:
+        """Decode the whole view into a TLV object owning its data."""
+        tlv = TLV(self.codec.indent, self.codec.tag_size, self.codec.len_size, self.codec.endian)
+        tlv.set_local_tag_map(self.tag_map)
+        tlv.parse_array(self.to_byte_array())
+        return tlv
+
+    def _release(self) -> None:
+        for value in self._values.values():
+            if isinstance(value, TLVView):
+                value._release()
+        self._data = None
+
+
+class Batch:
+    """Messages of one ring entry, viewed in shared memory.
+
+    The views are valid until release(), which gives the space back to the
+    producer. Batches can be used as context managers.
+    """
+
+    def __init__(self, ring: SharedRing, views: List[TLVView], end: int):
+        self._ring = ring
+        self._views = views
+        self._end = end
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+    def __len__(self):
+        return len(self._views)
+
+    def __getitem__(self, index: int) -> TLVView:
+        return self._views[index]
+
+    def __iter__(self) -> Iterator[TLVView]:
+        return iter(self._views)
+
+    def release(self) -> None:
+        if self._ring is None:
+            return
+        for view in self._views:
+            view._release()
+        self._ring._release(self._end)
+        self._ring = None
+
+
+class SharedRing:
+    """Single producer, single consumer ring of TLV batches in shared memory.
+
+    The producer encodes messages straight into the ring, the consumer
+    reads them through TLVView objects over the ring, so messages are
+    neither pickled nor copied between processes. A ring passed to another
+    process (e.g. as multiprocessing.Process argument) attaches to the same
+    memory block.
+    """
+
+    def __init__(
+        self, name: str = None, size: int = 1 << 24, create: bool = False, codec: TLV = None
+    ):
+        """
+        :args:
+            name: name of the shared memory block, generated if None.
+            size: size of the data region when creating the ring.
+            create: create the ring, attach to an existing one otherwise.
+            codec: TLV object holding the settings used to view messages, a
+                default TLV() if None.
+        """
+        if shared_memory is None:
+            raise RuntimeError("Shared memory rings need Python 3.8 or later")
+        self.codec = TLV() if codec is None else codec
+        if create:
+            size = _aligned(size)
+            self._shm = shared_memory.SharedMemory(name, create=True, size=DATA_OFFSET + size)
+            buf = self._shm.buf
+            POSITION.pack_into(buf, CAPACITY_OFFSET, size)
+            POSITION.pack_into(buf, WRITE_OFFSET, 0)
+            POSITION.pack_into(buf, READ_OFFSET, 0)
+        else:
+            self._shm = shared_memory.SharedMemory(name)
+        self._buf = self._shm.buf
+        self.capacity = POSITION.unpack_from(self._buf, CAPACITY_OFFSET)[0]
+        # Process that removes the ring, forked children only detach
+        self._owner = os.getpid() if create else None
+        # Next entry the consumer reads, ahead of the released position
+        self._next_read = POSITION.unpack_from(self._buf, READ_OFFSET)[0]
+        self._released = self._next_read
+
+    def __reduce__(self):
+        return (SharedRing, (self.name, 0, False, self.codec))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    def _position(self, offset: int) -> int:
+        return POSITION.unpack_from(self._buf, offset)[0]
+
+    def _wait(self, ready, block: bool, timeout: float, error: type) -> None:
+        if ready():
+            return
+        if not block:
+            raise error
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not ready():
+            if deadline is not None and time.monotonic() >= deadline:
+                raise error
+            time.sleep(POLL_INTERVAL)
+
+    def put(
+        self, messages: Iterable[Any[TLV, bytes]], block: bool = True, timeout: float = None
+    ) -> None:
+        """Write a batch of messages as one entry of the ring.
+
+        :args:
+            messages: TLV objects or encoded messages.
+            block: wait for space, raise queue.Full at once otherwise.
+            timeout: maximum wait in seconds, forever if None.
+        """
+        encoded = []
+        size = 0
+        for message in messages:
+            buffers = message.to_buffers() if isinstance(message, TLV) else (message,)
+            length = sum(len(buf) for buf in buffers)
+            encoded.append((length, buffers))
+            size += FRAME_HEADER_SIZE + length
+        entry_size = _aligned(ENTRY.size + size)
+        if entry_size > self.capacity:
+            raise ValueError(f"Batch of {size} bytes does not fit in the ring")
+
+        write = self._position(WRITE_OFFSET)
+        index = write % self.capacity
+        skip = self.capacity - index if self.capacity - index < entry_size else 0
+
+        def has_space():
+            used = write - self._position(READ_OFFSET)
+            return self.capacity - used >= skip + entry_size
+
+        self._wait(has_space, block, timeout, queue.Full)
+        buf = self._buf
+        if skip:
+            ENTRY.pack_into(buf, DATA_OFFSET + index, WRAP)
+            index = 0
+        pos = DATA_OFFSET + index
+        ENTRY.pack_into(buf, pos, size)
+        pos += ENTRY.size
+        for length, buffers in encoded:
+            buf[pos : pos + FRAME_HEADER_SIZE] = length.to_bytes(FRAME_HEADER_SIZE, "big")
+            pos += FRAME_HEADER_SIZE
+            for data in buffers:
+                buf[pos : pos + len(data)] = data
+                pos += len(data)
+        # Publish the entry once it is fully written
+        POSITION.pack_into(buf, WRITE_OFFSET, write + skip + entry_size)
+
+    def get(
+        self, block: bool = True, timeout: float = None, tag_map: Any[Dict, TagMapHandle] = None
+    ) -> Batch:
+        """Read the next batch of messages.
+
+        :args:
+            block: wait for a batch, raise queue.Empty at once otherwise.
+            timeout: maximum wait in seconds, forever if None.
+            tag_map: tag map of the views, or a TagMapHandle from
+                uttlv.registry, self.codec.tag_map if None.
+        """
+        tag_map = resolve_tag_map(tag_map)
+        self._wait(
+            lambda: self._position(WRITE_OFFSET) > self._next_read, block, timeout, queue.Empty
+        )
+        buf = self._buf
+        read = self._next_read
+        index = read % self.capacity
+        size = ENTRY.unpack_from(buf, DATA_OFFSET + index)[0]
+        if size == WRAP:
+            read += self.capacity - index
+            index = 0
+            size = ENTRY.unpack_from(buf, DATA_OFFSET)[0]
+        views = []
+        pos = DATA_OFFSET + index + ENTRY.size
+        end = pos + size
+        while pos < end:
+            length = int.from_bytes(buf[pos : pos + FRAME_HEADER_SIZE], "big")
+            pos += FRAME_HEADER_SIZE
+            views.append(TLVView(buf, self.codec, tag_map, pos, pos + length))
+            pos += length
+        self._next_read = read + _aligned(ENTRY.size + size)
+        return Batch(self, views, self._next_read)
+
+    def _release(self, end: int) -> None:
+        # Batches released out of order release the ones before them
+        if end > self._released:
+            self._released = end
+            POSITION.pack_into(self._buf, READ_OFFSET, end)
+
+    def close(self) -> None:
+        """Detach from the ring, removing it if this object created it."""
+        if self._shm is None:
+            return
+        self._buf = None
+        self._shm.close()
+        if self._owner == os.getpid():
+            self._shm.unlink()
+        self._shm = None
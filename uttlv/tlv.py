@@ -2,12 +2,19 @@ from __future__ import annotations
 
 import enum
 import math
+import os
+import sys
+import zlib
 from binascii import hexlify
-from typing import Any, Dict
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import Any, Dict, List
 
+from .cache import LRUCache
 from .encoder import (
     BytesEncoder,
     DefaultEncoder,
+    FileSliceEncoder,
     Int8Encoder,
     Int16Encoder,
     Int32Encoder,
@@ -15,6 +22,12 @@ from .encoder import (
     NestedEncoder,
     Utf8Encoder,
 )
+from .fileslice import FileReader, FileSlice
+from .registry import TagMapHandle, resolve_tag_map
+
+# len_size of the LEB128 length form: 7 bits per byte, least significant
+# group first, bit 8 set on all bytes but the last
+VARINT = "varint"
 
 
 class TLV:
@@ -35,37 +48,75 @@ class TLV:
             tag value is the int tag value.
             class name is the name of the class that represents the type
                 of the value.
+
+    A tag config may also hold a TLV.Config.Cache entry with an LRUCache,
+    so repeated raw values of that tag are decoded only once. Values of
+    nested tag maps are then decoded into shared FrozenTLV objects.
     """
 
-    Config = enum.Enum("Config", "Type Name")
+    class Config(enum.Enum):
+        Type = 1
+        Name = 2
+        Cache = 3
+
+        # Members are singletons, so the identity hash is valid, and unlike
+        # the hash of Enum it runs in C: tag configs are read per field
+        __hash__ = object.__hash__
+
     _global_tag_map = {}
 
-    def __init__(self, indent=4, tag_size=1, len_size=None, endian="big"):
+    def __init__(
+        self, indent=4, tag_size=1, len_size=None, endian="big", limits=None, checksum=None
+    ):
         """
         :args:
             indent: How many spaces to use in tree() method
-            tag_size: How many bytes a tag will contain in the array
+            tag_size: How many bytes a tag will contain in the array, None
+                        for BER tags, whose size is given by the continuation
+                        bits of each tag
             len_size: How many bytes the length info will occupy in the final
                         array, None (default) for automatically determine per
-                        field
+                        field, "varint" for LEB128 lengths
+            limits: ParseLimits enforced when parsing, None for no limits
+            checksum: Checksum trailing field added when encoding and
+                        verified when parsing, None for no checksum. Nested
+                        objects have none
         """
         super().__init__()
         self.indent = indent
         self.tag_size = tag_size
         self.len_size = len_size
         self.endian = endian
+        self.limits = limits
+        self.checksum = checksum
+        # Nesting depth while parsing, 0 for top level objects
+        self._depth = 0
         self._items = {}
         self._local_tag_map = None
+        # Encoded size of each non-TLV field, see encoded_size()
+        self._field_sizes = {}
+        self._field_sizes_config = None
+        # TLVPool this object belongs to, if any
+        self._pool = None
 
     @property
     def tag_map(self) -> Dict:
-        return self._local_tag_map or TLV._global_tag_map
+        tag_map = self._local_tag_map
+        if not tag_map:
+            return TLV.global_tag_map()
+        return resolve_tag_map(tag_map)
+
+    @classmethod
+    def global_tag_map(cls) -> Dict:
+        """Return the global tag map, the current version of a TagMapHandle."""
+        return resolve_tag_map(cls._global_tag_map)
 
     def __setitem__(self, key, value):
         real_key = self.__getkey__(key)
         self.check_key(real_key)
         self.check_value(value)
         self._items[real_key] = value
+        self._field_sizes.pop(real_key, None)
 
     def __getitem__(self, key):
         real_key = self.__getkey__(key)
@@ -85,6 +136,10 @@ class TLV:
         raise KeyError(f"Invalid key {str(key)}")
 
     def __getattr__(self, name):
+        # Private and special names are never tags, this keeps copy and pickle
+        # from recursing while the instance is being rebuilt
+        if name.startswith("_"):
+            raise AttributeError(name)
         return self.__getitem__(name)
 
     def __eq__(self, other):
@@ -104,7 +159,49 @@ class TLV:
 
         Useful for parsing nested structures.
         """
-        return TLV(self.indent, self.tag_size, self.len_size, self.endian)
+        tlv = TLV(self.indent, self.tag_size, self.len_size, self.endian, self.limits)
+        tlv._depth = self._depth + 1
+        return tlv
+
+    def _acquire_child(self, tag: int) -> TLV:
+        """Return the TLV object a nested value of tag should be parsed into.
+
+        Objects from a TLVPool reuse their pooled children, other objects
+        get a new one.
+        """
+        if self._pool is None:
+            return self._new_equivalent_tlv()
+        child = self._items.get(tag)
+        if isinstance(child, TLV) and child._pool is self._pool:
+            child.clear()
+        else:
+            child = self._pool.acquire()
+            child.checksum = None
+        child._depth = self._depth + 1
+        return child
+
+    def clear(self) -> None:
+        """Remove all tags, keeping settings and the local tag map.
+
+        Nested objects taken from a TLVPool are released back to it.
+        """
+        pool = self._pool
+        if pool is not None:
+            for value in self._items.values():
+                if isinstance(value, TLV) and value._pool is pool:
+                    pool.release(value)
+        self._items.clear()
+        self._field_sizes.clear()
+
+    def reset(self) -> None:
+        """Remove all tags and the local tag map, as if newly created."""
+        self.clear()
+        self._local_tag_map = None
+        self._depth = 0
+
+    def freeze(self) -> FrozenTLV:
+        """Return an immutable copy of this object, see FrozenTLV."""
+        return FrozenTLV(self)
 
     @classmethod
     def set_tag_map(cls, tag_map: Dict) -> None:
@@ -116,36 +213,48 @@ class TLV:
         cls.set_global_tag_map(tag_map)
 
     @classmethod
-    def set_global_tag_map(cls, tag_map: Dict) -> None:
+    def set_global_tag_map(cls, tag_map: Any[Dict, TagMapHandle]) -> None:
         """Set a tag map globally for all classes
 
         :args:
-            map: dict with keys names
+            map: dict with keys names, or a TagMapHandle from
+                uttlv.registry, whose current version is used
         """
-        # Check if the map has correct types
+        if not isinstance(tag_map, TagMapHandle):
+            cls.validate_tag_map(tag_map)
+        cls._global_tag_map = tag_map
+
+    @classmethod
+    def validate_tag_map(cls, tag_map: Mapping) -> None:
+        """Check the types of a tag map, nested tag maps included."""
         al_types = ALLOWED_TYPES.keys()
         for tag, config in tag_map.items():
-            if not isinstance(config, dict):
+            if not isinstance(config, Mapping):
                 raise TypeError("Invalid tag config type")
             tag_config = config.get(TLV.Config.Type, "")
-            if tag_config not in al_types:
+            if isinstance(tag_config, Mapping):
+                cls.validate_tag_map(tag_config)
+            elif tag_config not in al_types:
                 raise AttributeError(f"Invalid tag type {tag_config} for {tag} -> {config}")
-        cls._global_tag_map = tag_map
 
-    def set_local_tag_map(self, tag_map: Dict) -> None:
+    def set_local_tag_map(self, tag_map: Any[Dict, TagMapHandle]) -> None:
         """Set a class-instance-specific tag map.
 
         :args:
-            map: tag map to set class instance to.
+            map: tag map to set class instance to, or a TagMapHandle from
+                uttlv.registry. Handles are resolved on each parse, so
+                nested objects only get their tag map when parsed.
         """
         self._local_tag_map = tag_map
+        if isinstance(tag_map, TagMapHandle):
+            return
 
         # Iterate through any nested tag maps
         for index, cfg in tag_map.items():
             tg_type = cfg.get(TLV.Config.Type)
-            if tg_type is not None and type(tg_type) is dict:
+            if tg_type is not None and isinstance(tg_type, Mapping):
                 if index not in self._items:
-                    self._items[index] = self._new_equivalent_tlv()
+                    self._items[index] = self._acquire_child(index)
                 self._items[index].set_local_tag_map(tg_type)
 
     def check_key(self, key: int) -> bool:
@@ -154,8 +263,11 @@ class TLV:
         :args:
             key: key int value.
         """
-        if not isinstance(key, int) or (key < 0 or key >= 2**16):
+        max_key = 2**16 if self.tag_size is not None else 2**32
+        if not isinstance(key, int) or (key < 0 or key >= max_key):
             raise TypeError("Invalid key format.")
+        if self.tag_size is None and not _is_ber_tag(key):
+            raise TypeError(f"Invalid BER tag {key:#x}.")
         return True
 
     def check_value(self, value: Any[TLV, str, int, bytes]) -> bool:
@@ -164,57 +276,240 @@ class TLV:
         :args:
             value: value to be inserted.
         """
-        if not any(isinstance(value, t) for t in ALLOWED_TYPES):
+        # Values mostly are of an allowed type, not of a subclass of one
+        if type(value) not in ALLOWED_TYPES and not any(
+            isinstance(value, t) for t in ALLOWED_TYPES
+        ):
             raise TypeError(f"Invalid value type format {type(value)}.")
         return True
 
+    def header_table(self) -> HeaderTable:
+        """Return the shared HeaderTable for the current settings."""
+        key = (self.tag_size, self.len_size, self.endian)
+        table = _HEADER_TABLES.get(key)
+        if table is None:
+            table = _HEADER_TABLES[key] = HeaderTable(TLV(0, *key))
+        return table
+
+    def _encode_tag(self, tag: int) -> bytes:
+        if self.tag_size is None:
+            # BER tags are the tag bytes themselves, most significant first
+            return int(tag).to_bytes(max(1, (tag.bit_length() + 7) // 8), byteorder="big")
+        return int(tag).to_bytes(self.tag_size, byteorder=self.endian)
+
+    @property
+    def min_header_size(self) -> int:
+        """Smallest number of bytes a tag and length header can take."""
+        len_size = 1 if self.len_size in (None, VARINT) else self.len_size
+        return (self.tag_size or 1) + len_size
+
+    def is_constructed(self, tag: int) -> bool:
+        """Check if a BER tag has the constructed bit set in its first byte."""
+        if self.tag_size is not None:
+            return False
+        first = tag >> (8 * ((tag.bit_length() - 1) // 8)) if tag > 0xFF else tag
+        return bool(first & 0x20)
+
     def encode_length(self, value: bytes) -> bytes:
         """Translate the length of value into an array."""
-        required_len_size = math.ceil(len(value).bit_length() / 8)
+        return self._encode_length(len(value))
+
+    def _encode_length(self, length: int) -> bytes:
+        len_field_size = self.len_field_size(length)
+        if self.len_size == VARINT:
+            if len_field_size == 2:
+                # Most common form past the header table, see HeaderTable
+                return bytes((0x80 | (length & 0x7F), length >> 7))
+            field = bytearray(len_field_size)
+            for i in range(len_field_size - 1):
+                field[i] = 0x80 | (length & 0x7F)
+                length >>= 7
+            field[-1] = length
+            return bytes(field)
+        if not self.len_size and length >= 128:
+            return bytes((0x80 + len_field_size - 1,)) + length.to_bytes(
+                len_field_size - 1, byteorder=self.endian
+            )
+        return length.to_bytes(len_field_size, byteorder=self.endian)
+
+    def len_field_size(self, length: int) -> int:
+        """Number of bytes encode_length() uses for a value of the given length."""
+        required_len_size = math.ceil(length.bit_length() / 8)
         if required_len_size > 16:
             raise AttributeError(
                 f"Max allowed value length is {2**(8*15)-1} bytes, "
-                f"given value is {len(value)} bytes"
+                f"given value is {length} bytes"
             )
 
         if not self.len_size:
-            if len(value) < 128:
-                return len(value).to_bytes(1, byteorder=self.endian)
+            if length < 128:
+                return 1
+            return 1 + required_len_size
 
-            return bytes((0x80 + required_len_size,)) + len(value).to_bytes(
-                required_len_size, byteorder=self.endian
-            )
+        if self.len_size == VARINT:
+            return max(1, (length.bit_length() + 6) // 7)
 
         if self.len_size < required_len_size:
             raise ValueError(
-                f"{value} takes up {required_len_size} bytes, "
+                f"Value of {length} bytes takes up {required_len_size} bytes, "
                 f"but len_size was defined as {self.len_size}"
             )
 
-        return len(value).to_bytes(self.len_size, byteorder=self.endian)
+        return self.len_size
 
-    def to_byte_array(self) -> bytes:
-        """Translate all keys and values into an array of bytes."""
-        data = bytes()
+    def encoded_size(self) -> int:
+        """Size in bytes of to_byte_array() output, computed without encoding.
+
+        Sizes of non-TLV fields are cached until the field is set again.
+        """
+        config = (self.tag_size, self.len_size)
+        if self._field_sizes_config != config:
+            self._field_sizes = {}
+            self._field_sizes_config = config
+        sizes = self._field_sizes
+        headers = self.header_table()
+        size = 0
         for tag, value in self._items.items():
-            formatter = ALLOWED_TYPES.get(type(value))
-            formatted_value = formatter().default(value, self)
-            # Create array
-            data += int(tag).to_bytes(self.tag_size, byteorder=self.endian)
-            data += self.encode_length(formatted_value)
-            data += formatted_value
-        return data
+            field_size = sizes.get(tag)
+            if field_size is None:
+                if isinstance(value, TLV):
+                    value_size = value.encoded_size()
+                else:
+                    value_size = encoder_for(value)().size_of(value, self)
+                field_size = len(headers.tag(tag)) + self.len_field_size(value_size) + value_size
+                if not isinstance(value, TLV):
+                    sizes[tag] = field_size
+            size += field_size
+        if self.checksum is not None:
+            size += len(headers.header(self.checksum.tag, Checksum.SIZE)) + Checksum.SIZE
+        return size
+
+    def to_buffers(self, streamed: bool = False, canonical: bool = False) -> List[bytes]:
+        """Translate all keys and values into a list of buffers.
+
+        Joining the buffers gives the same result as to_byte_array(), but
+        bytes values are returned as they are, without being copied, which
+        suits vectored writes (see uttlv.writer).
+
+        :args:
+            streamed: return FileSlice values as they are instead of reading
+                them, for writers that can copy them from file.
+            canonical: encode tags in ascending order, in nested objects too.
+        """
+        headers = self.header_table()
+        buffers = []
+        checksum = self.checksum
+        if checksum is not None:
+            digest = checksum.initial
+        items = self._items.items()
+        if canonical:
+            items = sorted(items, key=_item_tag)
+        for tag, value in items:
+            if isinstance(value, TLV):
+                value_buffers = value.to_buffers(streamed, canonical)
+                length = sum(len(buf) for buf in value_buffers)
+            elif streamed and isinstance(value, FileSlice):
+                value_buffers = (value,)
+                length = len(value)
+            else:
+                encoder_cls = encoder_for(value)
+                encoder = encoder_cls()
+                in_place = _ENCODES_INTO.get(encoder_cls)
+                if in_place is None:
+                    in_place = _ENCODES_INTO[encoder_cls] = hasattr(encoder_cls, "encode_into")
+                if in_place:
+                    formatted_value = bytearray(encoder.size_of(value, self))
+                    encoder.encode_into(value, formatted_value, 0)
+                else:
+                    formatted_value = encoder.default(value, self)
+                value_buffers = (formatted_value,)
+                length = len(formatted_value)
+            # Header with tag and length
+            header = headers.header(tag, length)
+            buffers.append(header)
+            buffers.extend(value_buffers)
+            if checksum is not None:
+                digest = checksum.update(header, digest)
+                for buf in value_buffers:
+                    digest = checksum.update(buf, digest)
+        if checksum is not None:
+            buffers.append(headers.header(checksum.tag, Checksum.SIZE))
+            buffers.append(checksum.encode(digest))
+        return buffers
+
+    def to_byte_array(self, canonical: bool = False) -> bytes:
+        """Translate all keys and values into an array of bytes.
+
+        :args:
+            canonical: encode tags in ascending order, in nested objects too,
+                so equal objects always give the same array whatever the
+                order their tags were set in (see uttlv.canonical).
+        """
+        return b"".join(self.to_buffers(canonical=canonical))
+
+    def encode_into(self, buffer: Any[bytearray, memoryview], offset: int = 0) -> int:
+        """Encode the object straight into a writable buffer.
+
+        The buffer must hold encoded_size() bytes from offset. Values whose
+        encoder has an encode_into(value, buffer, offset) method write
+        themselves in place, others are encoded and copied.
+
+        :returns:
+            number of bytes written.
+        """
+        headers = self.header_table()
+        checksum = self.checksum
+        if checksum is not None:
+            digest = checksum.initial
+            written = memoryview(buffer)
+        pos = offset
+        for tag, value in self._items.items():
+            start = pos
+            if isinstance(value, TLV):
+                length = value.encoded_size()
+                header = headers.header(tag, length)
+                buffer[pos : pos + len(header)] = header
+                pos += len(header)
+                pos += value.encode_into(buffer, pos)
+            else:
+                encoder_cls = encoder_for(value)
+                encoder = encoder_cls()
+                in_place = _ENCODES_INTO.get(encoder_cls)
+                if in_place is None:
+                    in_place = _ENCODES_INTO[encoder_cls] = hasattr(encoder_cls, "encode_into")
+                if in_place:
+                    length = encoder.size_of(value, self)
+                    header = headers.header(tag, length)
+                    buffer[pos : pos + len(header)] = header
+                    pos += len(header)
+                    pos += encoder.encode_into(value, buffer, pos)
+                else:
+                    formatted_value = encoder.default(value, self)
+                    header = headers.header(tag, len(formatted_value))
+                    buffer[pos : pos + len(header)] = header
+                    pos += len(header)
+                    buffer[pos : pos + len(formatted_value)] = formatted_value
+                    pos += len(formatted_value)
+            if checksum is not None:
+                # One pass: each field is checksummed as it is written
+                digest = checksum.update(written[start:pos], digest)
+        if checksum is not None:
+            written.release()
+            header = headers.header(checksum.tag, Checksum.SIZE)
+            buffer[pos : pos + len(header)] = header
+            pos += len(header)
+            buffer[pos : pos + Checksum.SIZE] = checksum.encode(digest)
+            pos += Checksum.SIZE
+        return pos - offset
 
     def tree(self, offset: int = 0, use_names: bool = False) -> str:
         """Print a tree view of the object."""
         tree_str = "" if offset == 0 else "\r\n"
         for tag, value in self._items.items():
-            encoder = ALLOWED_TYPES.get(type(value))
+            encoder = encoder_for(value)
             encoded_value = encoder().to_string(value, offset, use_names)
             # Create line
-            encoded_tag = str(
-                hexlify(int(tag).to_bytes(self.tag_size, byteorder=self.endian)), "ascii"
-            )
+            encoded_tag = str(hexlify(self.header_table().tag(tag)), "ascii")
             if use_names:
                 tag_map = self.tag_map.get(tag, {})
                 name = tag_map.get(TLV.Config.Name, None)
@@ -228,6 +523,225 @@ class TLV:
             return 1
         return data[0] - 0x80 + 1
 
+    def decode_header(self, data: Any[bytes, memoryview], pos: int = 0, end: int = None) -> tuple:
+        """Decode the tag and length header starting at data[pos].
+
+        :args:
+            data: encoded data.
+            pos: offset of the header.
+            end: end of the region holding the header, len(data) if None.
+
+        :returns:
+            (tag, length, header size) tuple.
+        """
+        start = pos
+        # Tag value
+        if self.tag_size is None:
+            end = len(data) if end is None else end
+            tag_end = pos + 1
+            if data[pos] & 0x1F == 0x1F:
+                # Subsequent bytes follow while bit 8 is set
+                while tag_end < end and data[tag_end] & 0x80:
+                    tag_end += 1
+                tag_end += 1
+            if tag_end >= end:
+                raise ValueError(f"Header truncated at offset {pos}")
+            tag = int.from_bytes(data[pos:tag_end], byteorder="big")
+            pos = tag_end
+        else:
+            tag = int.from_bytes(data[pos : pos + self.tag_size], byteorder=self.endian)
+            pos += self.tag_size
+        # Len value
+        if self.len_size == VARINT:
+            length = 0
+            shift = 0
+            while True:
+                if pos >= len(data) or shift > 8 * 16:
+                    raise ValueError(f"Invalid length at offset {start}")
+                byte = data[pos]
+                pos += 1
+                length |= (byte & 0x7F) << shift
+                if byte < 0x80:
+                    break
+                shift += 7
+        elif self.len_size:
+            length = int.from_bytes(data[pos : pos + self.len_size], byteorder=self.endian)
+            pos += self.len_size
+        else:
+            len_size = self.decode_len_size(data[pos : pos + 1])
+            len_size_start = 0 if len_size == 1 else 1
+            length = int.from_bytes(
+                data[pos + len_size_start : pos + len_size], byteorder=self.endian
+            )
+            pos += len_size
+        return tag, length, pos - start
+
+    def iter_fields(self, data: Any[bytes, memoryview], start: int = 0, end: int = None):
+        """Iterate over the encoded fields of an array without decoding them.
+
+        Yields (tag, offset, length) tuples, where offset is the position of
+        the value inside data.
+        """
+        end = len(data) if end is None else end
+        if self.limits is not None:
+            yield from self._iter_fields_limited(data, start, end)
+            return
+        min_size = self.min_header_size
+        pos = start
+        while end - pos > min_size:
+            tag, length, header_size = self.decode_header(data, pos, end)
+            pos += header_size
+            # Value
+            yield tag, pos, min(length, max(end - pos, 0))
+            # Next value
+            pos += length
+
+    def _iter_fields_limited(self, data: Any[bytes, memoryview], start: int, end: int):
+        """iter_fields() checking every header against self.limits."""
+        limits = self.limits
+        limits.check_size(end - start)
+        min_size = self.min_header_size
+        if limits.strict:
+            min_size -= 1
+        pos = start
+        fields = 0
+        while end - pos > min_size:
+            fields += 1
+            if limits.max_fields is not None and fields > limits.max_fields:
+                raise ValueError(f"More than {limits.max_fields} fields")
+            tag, length, header_size = self.decode_header(data, pos, end)
+            if limits.strict and pos + header_size > end:
+                raise ValueError(f"Header truncated at offset {pos}")
+            pos += header_size
+            limits.check_value(length, end - pos)
+            yield tag, pos, min(length, max(end - pos, 0))
+            pos += length
+        if limits.strict and pos != end:
+            raise ValueError(f"{end - pos} trailing bytes after last field")
+
+    def _check_message(self, size: int) -> None:
+        """Check a whole message against self.limits before parsing it."""
+        limits = self.limits
+        if limits is None:
+            return
+        limits.check_size(size)
+        if limits.max_depth is not None and self._depth > limits.max_depth:
+            raise ValueError(f"Nesting deeper than {limits.max_depth} levels")
+
+    def _parse_value(self, tag_map: Dict, tag: int, value: bytes) -> Any:
+        """Decode a raw value according to the tag map, see _decode_field()."""
+        return self._decode_field(tag_map, tag, value, 0, len(value))
+
+    def _decode_field(
+        self, tag_map: Dict, tag: int, data: Any[bytes, memoryview], offset: int, length: int
+    ) -> Any:
+        """Decode the value at data[offset:offset + length] according to the tag map.
+
+        Encoders with a decode_from(buffer, offset, length, codec) method
+        read the value in place, others get it sliced. Values of BER
+        constructed tags missing from the tag map are parsed as nested TLV
+        objects.
+        """
+        tg_cfg = tag_map.get(tag)
+        tg_type = None if tg_cfg is None else tg_cfg.get(TLV.Config.Type)
+        if tg_type is None:
+            value = bytes(data[offset : offset + length])
+            if self.tag_size is None and self.is_constructed(tag):
+                if value and len(value) < self.min_header_size:
+                    # Not a TLV array, kept as bytes as typed nested tags do
+                    return value
+                child = self._acquire_child(tag)
+                if value:
+                    child.parse_array(value)
+                return child
+            return value
+        cache = tg_cfg.get(TLV.Config.Cache)
+        # Tag maps are validated, so types are classes or nested tag maps
+        formatter = ALLOWED_TYPES.get(tg_type) if isinstance(tg_type, type) else None
+        if cache is None and formatter is not None and tg_type is not TLV:
+            in_place = _DECODES_FROM.get(formatter)
+            if in_place is None:
+                in_place = _DECODES_FROM[formatter] = hasattr(formatter, "decode_from")
+            if in_place:
+                return formatter().decode_from(data, offset, length, self)
+            # Scalar encoders only read the settings of the codec
+            return formatter().parse(bytes(data[offset : offset + length]), self)
+        value = bytes(data[offset : offset + length])
+        if isinstance(tg_type, Mapping):
+            # *Ideally* we would include this in ALLOWED_TYPES,
+            # but this is the easiest way I can think of
+            # to pass in the tag map config at the same time.
+            if cache is not None:
+                return self._cached_subtree(cache, tg_type, value)
+            return NestedEncoder(tg_type).parse(value, self._acquire_child(tag))
+        if formatter is None:
+            return value
+        if tg_type is TLV:
+            return formatter().parse(value, self._acquire_child(tag))
+        return self._cached_parse(cache, formatter, value)
+
+    def _cached_parse(self, cache: LRUCache, formatter: type, value: bytes) -> Any:
+        """Decode a raw value through a decode cache, interning strings."""
+
+        def parse():
+            return _intern(formatter().parse(value, self))
+
+        return cache.lookup((formatter, self.endian, bytes(value)), parse)
+
+    def _cached_subtree(self, cache: LRUCache, tag_map: Mapping, value: bytes) -> FrozenTLV:
+        """Decode a nested value through a subtree cache.
+
+        Equal raw values of the same nested tag map share one FrozenTLV.
+        """
+
+        def parse():
+            child = self._new_equivalent_tlv()
+            NestedEncoder(tag_map).parse(value, child)
+            # Keep the raw value as encoded form, as from_array() does
+            return tag_map, FrozenTLV(child, raw)
+
+        raw = bytes(value)
+        # Entries hold their map, so its id is not reused while they live
+        key = (
+            id(tag_map),
+            self.tag_size,
+            self.len_size,
+            self.endian,
+            None if self.limits is None else self.limits.as_tuple(),
+            self._depth,
+            raw,
+        )
+        return cache.lookup(key, parse)[1]
+
+    def _iter_checked(self, data: Any[memoryview, FileReader], fields):
+        """Pass fields through, checking them against the checksum field.
+
+        The checksum is updated with each field as it is parsed, and must
+        match the checksum field, which must be the last one.
+        """
+        checksum = self.checksum
+        digest = checksum.initial
+        pos = 0
+        verified = False
+        for tag, offset, length in fields:
+            if verified:
+                raise ValueError(f"Field after checksum at offset {pos}")
+            if tag == checksum.tag:
+                if bytes(data[offset : offset + length]) != checksum.encode(digest):
+                    raise ValueError("Checksum mismatch")
+                verified = True
+                continue
+            end = offset + length
+            if isinstance(data, FileReader) and end - pos >= data.chunk_size:
+                # Spilled values are read in chunks, not into memory
+                digest = checksum.update(FileSlice(data.fd, pos, end - pos), digest)
+            else:
+                digest = checksum.update(data[pos:end], digest)
+            pos = end
+            yield tag, offset, length
+        if not verified:
+            raise ValueError("Missing checksum")
+
     def parse_array(self, data: Any[list, bytes]) -> bool:
         """Parse a byte array into a TLV object"""
         if isinstance(data, list):
@@ -235,44 +749,51 @@ class TLV:
         elif not isinstance(data, bytes):
             raise TypeError("Data must be bytes type.")
         # Check size
-        min_len_size = self.len_size or 1
-        min_size = min_len_size + self.tag_size
+        min_size = self.min_header_size
         if len(data) < min_size:
             raise AttributeError(f"Data must be at least {min_size} bytes long")
+        self._check_message(len(data))
         # Start parsing
-        aux = data
-        while len(aux) > min_size:
-            # Tag value
-            tag = int.from_bytes(aux[: self.tag_size], byteorder=self.endian)
-            # Len value
-            aux = aux[self.tag_size :]
-            len_size = self.len_size or self.decode_len_size(aux)
-            len_size_start = (0 if self.len_size != None or len_size == 1 else 1)
-            length = int.from_bytes(aux[len_size_start:len_size], byteorder=self.endian)
-            # Value
-            aux = aux[len_size:]
-            value = aux[:length]
-            # Next value
-            aux = aux[length:]
-            # Check if tag has any parser
-            tg_cfg = self.tag_map.get(tag)
-            if tg_cfg is not None:
-                tg_type = tg_cfg.get(TLV.Config.Type)
-                if tg_type is not None:
-                    # *Ideally* we would include this in ALLOWED_TYPES,
-                    # but this is the easiest way I can think of
-                    # to pass in the tag map config at the same time.
-                    if type(tg_type) is dict:
-                        value = NestedEncoder(tg_type).parse(value, self._new_equivalent_tlv())
-                    else:
-                        formatter = ALLOWED_TYPES.get(tg_type)
-                        if formatter is not None:
-                            value = formatter().parse(value, self._new_equivalent_tlv())
+        tag_map = self.tag_map
+        fields = self.iter_fields(data)
+        if self.checksum is not None:
+            fields = self._iter_checked(memoryview(data), fields)
+        for tag, offset, length in fields:
             # Set value
-            self[tag] = value
+            self[tag] = self._decode_field(tag_map, tag, data, offset, length)
         # Done parsing
         return True
 
+    def parse_file(self, file: Any[str, os.PathLike, int], spill_threshold: int = None) -> bool:
+        """Parse an encoded file into a TLV object, reading it in chunks.
+
+        :args:
+            file: path or file descriptor of the file.
+            spill_threshold: values of bytes (or untyped) tags longer than
+                this are not read into memory, they are set as FileSlice
+                objects referencing their region in the file.
+        """
+        reader = FileReader(file)
+        try:
+            min_size = self.min_header_size
+            if len(reader) < min_size:
+                raise AttributeError(f"Data must be at least {min_size} bytes long")
+            self._check_message(len(reader))
+            tag_map = self.tag_map
+            fields = self.iter_fields(reader)
+            if self.checksum is not None:
+                fields = self._iter_checked(reader, fields)
+            for tag, offset, length in fields:
+                tg_type = tag_map.get(tag, {}).get(TLV.Config.Type, bytes)
+                if spill_threshold is not None and length > spill_threshold and tg_type is bytes:
+                    value = FileSlice(file, offset, length)
+                else:
+                    value = self._parse_value(tag_map, tag, reader[offset : offset + length])
+                self[tag] = value
+        finally:
+            reader.close()
+        return True
+
 
 class EmptyTLV(TLV):
     """Empty TLV"""
@@ -284,15 +805,28 @@ class EmptyTLV(TLV):
     def __setitem__(self, key, value):
         raise TypeError("Invalid argument")
 
-    def to_byte_array(self) -> bytes:
-        value = int(self.tag).to_bytes(self.tag_size, byteorder="big")
-        len_size = self.len_size or 1
-        value += int(0).to_bytes(len_size, byteorder="big")
-        return value
+    def _encode_tag(self, tag: int) -> bytes:
+        if self.tag_size is None:
+            return super()._encode_tag(tag)
+        return int(tag).to_bytes(self.tag_size, byteorder="big")
+
+    def to_byte_array(self, canonical: bool = False) -> bytes:
+        return self._encode_tag(self.tag) + self._encode_length(0)
+
+    def encoded_size(self) -> int:
+        return len(self._encode_tag(self.tag)) + self.len_field_size(0)
+
+    def to_buffers(self, streamed: bool = False, canonical: bool = False) -> List[bytes]:
+        return [self.to_byte_array()]
+
+    def encode_into(self, buffer: Any[bytearray, memoryview], offset: int = 0) -> int:
+        data = self.to_byte_array()
+        buffer[offset : offset + len(data)] = data
+        return len(data)
 
     def tree(self, offset: int = 0, use_names: bool = False) -> str:
         tree_str = "" if offset == 0 else "\r\n"
-        tag = str(hexlify(int(self.tag).to_bytes(self.tag_size, byteorder="big")), "ascii")
+        tag = str(hexlify(self._encode_tag(self.tag)), "ascii")
         if use_names:
             tag_map = TLV.tag_map.get(self.tag, {})
             name = tag_map.get("name", None)
@@ -301,6 +835,261 @@ class EmptyTLV(TLV):
         return tree_str
 
 
+class FrozenTLV(TLV):
+    """Immutable TLV object.
+
+    The tag map and the encoded array are bound when the object is created,
+    so it can be shared between threads and used as a cache key without
+    copying. Nested TLV values are frozen as well.
+    """
+
+    def __init__(self, source: TLV, data: bytes = None):
+        """
+        :args:
+            source: TLV object to freeze.
+            data: encoded array of source, if already known.
+        """
+        super().__init__(
+            source.indent,
+            source.tag_size,
+            source.len_size,
+            source.endian,
+            source.limits,
+            source.checksum,
+        )
+        self._local_tag_map = source.tag_map
+        self._items = MappingProxyType(
+            {
+                tag: value.freeze() if isinstance(value, TLV) else value
+                for tag, value in source._items.items()
+            }
+        )
+        if data is None:
+            data = source.to_byte_array()
+        elif not isinstance(data, bytes):
+            data = bytes(data)
+        self._data = data
+        self._hash = hash(data)
+
+    @classmethod
+    def from_array(cls, data: Any[list, bytes], tag_map: Dict = None, **kwargs) -> FrozenTLV:
+        """Parse a byte array straight into a frozen object.
+
+        :args:
+            data: array to parse, kept as the object encoded form.
+            tag_map: tag map to bind, the global one if not given.
+            kwargs: same settings as TLV().
+        """
+        if isinstance(data, list):
+            data = bytes(data)
+        tlv = TLV(**kwargs)
+        tlv._local_tag_map = tag_map
+        tlv.parse_array(data)
+        return cls(tlv, data)
+
+    @property
+    def tag_map(self) -> Dict:
+        return self._local_tag_map
+
+    def __setitem__(self, key, value):
+        raise TypeError("FrozenTLV does not support item assignment")
+
+    def __hash__(self):
+        return self._hash
+
+    def __reduce__(self):
+        thawed = TLV(
+            self.indent, self.tag_size, self.len_size, self.endian, self.limits, self.checksum
+        )
+        thawed._local_tag_map = self._local_tag_map
+        thawed._items = dict(self._items)
+        return (FrozenTLV, (thawed, self._data))
+
+    def freeze(self) -> FrozenTLV:
+        return self
+
+    def set_local_tag_map(self, tag_map: Dict) -> None:
+        # Setting the bound map again is harmless, parents do it for their
+        # nested objects
+        if tag_map is not self._local_tag_map:
+            raise TypeError("FrozenTLV tag map can not be changed")
+
+    def clear(self) -> None:
+        raise TypeError("FrozenTLV can not be cleared")
+
+    def reset(self) -> None:
+        raise TypeError("FrozenTLV can not be cleared")
+
+    def parse_array(self, data: Any[list, bytes]) -> bool:
+        raise TypeError("FrozenTLV can not be parsed into")
+
+    def to_byte_array(self, canonical: bool = False) -> bytes:
+        if canonical:
+            return super().to_byte_array(canonical)
+        return self._data
+
+    def encoded_size(self) -> int:
+        return len(self._data)
+
+    def to_buffers(self, streamed: bool = False, canonical: bool = False) -> List[bytes]:
+        if canonical:
+            return super().to_buffers(streamed, canonical)
+        return [self._data]
+
+    def encode_into(self, buffer: Any[bytearray, memoryview], offset: int = 0) -> int:
+        buffer[offset : offset + len(self._data)] = self._data
+        return len(self._data)
+
+
+class ParseLimits:
+    """Resource limits enforced while parsing untrusted data.
+
+    Every limit is checked before the data it covers is sliced or decoded,
+    and raises ValueError when exceeded. None disables a limit.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = None,
+        max_value_length: int = None,
+        max_depth: int = None,
+        max_fields: int = None,
+        strict: bool = False,
+    ):
+        """
+        :args:
+            max_bytes: maximum size of a message, nested values included.
+            max_value_length: maximum declared length of a value.
+            max_depth: maximum nesting depth, 0 allowing no nested TLV.
+            max_fields: maximum number of fields in one TLV object.
+            strict: reject values shorter than their declared length and
+                bytes left after the last field, instead of ignoring them.
+        """
+        self.max_bytes = max_bytes
+        self.max_value_length = max_value_length
+        self.max_depth = max_depth
+        self.max_fields = max_fields
+        self.strict = strict
+
+    def as_tuple(self) -> tuple:
+        """Return the limits as a tuple, equal for equal limits."""
+        return (
+            self.max_bytes,
+            self.max_value_length,
+            self.max_depth,
+            self.max_fields,
+            self.strict,
+        )
+
+    def check_size(self, size: int) -> None:
+        if self.max_bytes is not None and size > self.max_bytes:
+            raise ValueError(f"Message of {size} bytes exceeds {self.max_bytes} bytes")
+
+    def check_value(self, length: int, available: int) -> None:
+        if self.max_value_length is not None and length > self.max_value_length:
+            raise ValueError(f"Value of {length} bytes exceeds {self.max_value_length} bytes")
+        if self.strict and length > available:
+            raise ValueError(f"Value of {length} bytes truncated to {max(available, 0)} bytes")
+
+
+class Checksum:
+    """Integrity check carried by a trailing field of a message.
+
+    The checksum covers every field before it, headers included, and is
+    encoded as a 4 bytes big endian value. It is updated field by field
+    while encoding and parsing, so it costs no extra pass over the data.
+    """
+
+    SIZE = 4
+    ALGORITHMS = {"crc32": (zlib.crc32, 0), "adler32": (zlib.adler32, 1)}
+
+    def __init__(self, tag: int, algorithm: str = "crc32"):
+        """
+        :args:
+            tag: tag of the checksum field.
+            algorithm: "crc32" or "adler32".
+        """
+        if algorithm not in self.ALGORITHMS:
+            raise ValueError(f"Invalid checksum algorithm {algorithm}")
+        self.tag = tag
+        self.algorithm = algorithm
+        self._update, self.initial = self.ALGORITHMS[algorithm]
+
+    def __repr__(self):
+        return f"Checksum({self.tag:#x}, {self.algorithm!r})"
+
+    def update(self, data: Any[bytes, memoryview, FileSlice], digest: int) -> int:
+        """Return digest updated with data."""
+        if isinstance(data, FileSlice):
+            for chunk in data.chunks():
+                digest = self._update(chunk, digest)
+            return digest
+        return self._update(data, digest)
+
+    def encode(self, digest: int) -> bytes:
+        return digest.to_bytes(self.SIZE, byteorder="big")
+
+
+class HeaderTable:
+    """Precomputed tag and length encodings for one set of TLV settings.
+
+    Length fields are precomputed for short values, tag fields are stored
+    the first time a tag is encoded, up to MAX_TAGS entries, and whole
+    headers of short values are kept up to MAX_HEADERS entries.
+    """
+
+    SHORT_LENGTHS = 256
+    MAX_TAGS = 4096
+    MAX_HEADERS = 4096
+
+    def __init__(self, codec: TLV):
+        """
+        :args:
+            codec: TLV object holding the settings, used for encoding.
+        """
+        self._codec = codec
+        self.lengths = tuple(codec._encode_length(n) for n in range(self.SHORT_LENGTHS))
+        self.tags = {}
+        self.headers = {}
+
+    def tag(self, tag: int) -> bytes:
+        """Return the encoded tag field."""
+        try:
+            return self.tags[tag]
+        except KeyError:
+            encoded = self._codec._encode_tag(tag)
+            if len(self.tags) < self.MAX_TAGS:
+                self.tags[tag] = encoded
+            return encoded
+
+    def length(self, length: int) -> bytes:
+        """Return the encoded length field."""
+        if length < self.SHORT_LENGTHS:
+            return self.lengths[length]
+        return self._codec._encode_length(length)
+
+    def header(self, tag: int, length: int) -> bytes:
+        """Return the encoded tag and length fields."""
+        if length >= self.SHORT_LENGTHS:
+            return self.tag(tag) + self._codec._encode_length(length)
+        key = (tag, length)
+        try:
+            return self.headers[key]
+        except KeyError:
+            header = self.tag(tag) + self.lengths[length]
+            if len(self.headers) < self.MAX_HEADERS:
+                self.headers[key] = header
+            return header
+
+
+# Header tables by (tag_size, len_size, endian)
+_HEADER_TABLES = {}
+# Whether encoder classes have the optional decode_from() and encode_into()
+# methods, looked up once per class
+_DECODES_FROM = {}
+_ENCODES_INTO = {}
+
+
 class TLVIterator:
     """Iterator class"""
 
@@ -333,4 +1122,37 @@ ALLOWED_TYPES = {
     Int64: Int64Encoder,
     bytes: BytesEncoder,
     str: Utf8Encoder,
+    FileSlice: FileSliceEncoder,
 }
+
+
+def _is_ber_tag(tag: int) -> bool:
+    """Check that a tag encodes as a well formed BER tag."""
+    if tag <= 0xFF:
+        return tag & 0x1F != 0x1F
+    encoded = tag.to_bytes((tag.bit_length() + 7) // 8, byteorder="big")
+    # Long form: low bits of the first byte all set, bit 8 set on all
+    # subsequent bytes but the last
+    return (
+        encoded[0] & 0x1F == 0x1F
+        and all(byte & 0x80 for byte in encoded[1:-1])
+        and not encoded[-1] & 0x80
+    )
+
+
+def _item_tag(item: tuple) -> int:
+    return item[0]
+
+
+def _intern(value: Any) -> Any:
+    if type(value) is str:
+        return sys.intern(value)
+    return value
+
+
+def encoder_for(value: Any) -> type:
+    """Return the encoder class for a value, None if its type is not allowed."""
+    formatter = ALLOWED_TYPES.get(type(value))
+    if formatter is None and isinstance(value, TLV):
+        formatter = ALLOWED_TYPES[TLV]
+    return formatter
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import os
+import socket
+from typing import Any, Callable, Iterable, List
+
+from .fileslice import FileSlice
+from .tlv import TLV
+
+try:
+    IOV_MAX = os.sysconf("SC_IOV_MAX")
+except (AttributeError, ValueError, OSError):  # pragma: no cover - platform dependent
+    IOV_MAX = 1024
+
+
+def _vector_writer(target: Any) -> Callable[[List], int]:
+    """Return a function writing a list of buffers to target with one call.
+
+    The returned function may write only part of the buffers and returns
+    the number of bytes written.
+    """
+    if isinstance(target, socket.socket):
+        if hasattr(target, "sendmsg"):
+            return target.sendmsg
+        return lambda buffers: target.send(b"".join(buffers))
+
+    if not isinstance(target, int):
+        # Data buffered by a file object must reach the descriptor first
+        flush = getattr(target, "flush", None)
+        if flush is not None:
+            flush()
+        target = target.fileno()
+
+    if hasattr(os, "writev"):
+        return lambda buffers: os.writev(target, buffers)
+    return lambda buffers: os.write(target, b"".join(buffers))
+
+
+def _write_all(write: Callable[[List], int], buffers: List) -> int:
+    """Write all buffers, retrying after partial writes."""
+    views = [memoryview(buf) for buf in buffers]
+    total = sum(view.nbytes for view in views)
+    first = 0
+    while first < len(views):
+        written = write(views[first:])
+        # Skip the buffers already written
+        while first < len(views) and written >= views[first].nbytes:
+            written -= views[first].nbytes
+            first += 1
+        if written:
+            views[first] = views[first][written:]
+    return total
+
+
+def write_messages(
+    target: Any, messages: Iterable[Any[TLV, bytes]], max_buffers: int = IOV_MAX
+) -> int:
+    """Write messages to a socket or file using vectored I/O.
+
+    Headers and values of consecutive messages are gathered and written
+    with a single sendmsg()/writev() call, up to max_buffers buffers per
+    call, so bytes values are never copied and many small messages share
+    one system call. FileSlice values are copied from their file with
+    sendfile().
+
+    :args:
+        target: blocking socket, file descriptor or file object.
+        messages: TLV objects or already encoded arrays.
+        max_buffers: maximum number of buffers per system call.
+
+    :returns:
+        number of bytes written.
+    """
+    write = _vector_writer(target)
+    total = 0
+    pending = []
+    for message in messages:
+        if isinstance(message, TLV):
+            buffers = message.to_buffers(streamed=True)
+        else:
+            buffers = (message,)
+        for buf in buffers:
+            if isinstance(buf, FileSlice):
+                if pending:
+                    total += _write_all(write, pending)
+                    pending = []
+                total += buf.copy_to(target)
+                continue
+            pending.append(buf)
+            if len(pending) >= max_buffers:
+                total += _write_all(write, pending)
+                pending = []
+    if pending:
+        total += _write_all(write, pending)
+    return total
+
+
+def write_message(target: Any, message: Any[TLV, bytes]) -> int:
+    """Write a single message, see write_messages()."""
+    return write_messages(target, (message,))